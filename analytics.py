@@ -0,0 +1,150 @@
+import threading
+
+import numpy as np
+
+from columnar import EPOCH_ORDINAL
+
+_scans = threading.local()
+
+
+def rows_scanned():
+    """Return how many table rows the aggregations computed on this thread have read.
+
+    Only computations count: a result served from a table's cache reads no
+    rows, and one aggregation built on another counts its table once.
+    """
+    return getattr(_scans, "rows", 0)
+
+
+def _cached(table, key, compute):
+    if key not in table.derived:
+        depth = getattr(_scans, "depth", 0)
+        _scans.depth = depth + 1
+        try:
+            table.derived[key] = compute()
+        finally:
+            _scans.depth = depth
+        if not depth:
+            _scans.rows = rows_scanned() + table.length
+    return table.derived[key]
+
+
+def breakdown(table):
+    """Flatten the nested muscles/cardio columns into a long-format table.
+
+    Returns a dict of equal-length arrays: ``row`` (source row), ``key``
+    (index into ``breakdown_keys(table)``, e.g. ("muscles", "Chest")) and
+    ``minutes``. Built once per table version and cached on the table.
+    """
+    def compute():
+        rows, keys, minutes = [], [], []
+        for key_index, (parent, name) in enumerate(breakdown_keys(table)):
+            column = table.columns[f"{parent}.{name}"][:table.length]
+            row = np.flatnonzero(~np.isnan(column)).astype(np.int32)
+            rows.append(row)
+            keys.append(np.full(len(row), key_index, dtype=np.int8))
+            minutes.append(column[row])
+        if not rows:
+            return {"row": np.empty(0, dtype=np.int32), "key": np.empty(0, dtype=np.int8),
+                    "minutes": np.empty(0, dtype=np.float32)}
+        return {"row": np.concatenate(rows), "key": np.concatenate(keys),
+                "minutes": np.concatenate(minutes)}
+    return _cached(table, "breakdown", compute)
+
+
+def breakdown_keys(table):
+    """Return the (parent, name) pairs indexed by ``breakdown(table)["key"]``"""
+    return [(parent, name) for parent, names in table.nested.items() for name in names]
+
+
+def nested_totals(table, parent):
+    """Return total minutes per key of one nested breakdown ({muscle: minutes})"""
+    def compute():
+        long = breakdown(table)
+        keys = breakdown_keys(table)
+        # The long table is grouped by key, so each key is one contiguous run
+        starts = np.searchsorted(long["key"], np.arange(len(keys)))
+        counts = np.diff(np.append(starts, len(long["key"])))
+        present = counts > 0
+        totals = np.zeros(len(keys))
+        if present.any():
+            totals[present] = np.add.reduceat(long["minutes"], starts[present], dtype=np.float64)
+        return list(zip(keys, totals.tolist()))
+    return {name: total for (key_parent, name), total in _cached(table, "nested_totals", compute)
+            if key_parent == parent}
+
+
+def muscle_totals(table):
+    """Return total minutes per muscle group over every workout"""
+    return nested_totals(table, "muscles")
+
+
+def category_totals(table, field="category", value="minutes"):
+    """Return the sum of ``value`` per category of ``field``, skipping empty ones"""
+    def compute():
+        codes = table.columns[field][:table.length].astype(np.int64)
+        weights = table.columns[value][:table.length]
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=weights[valid],
+                             minlength=len(table.dictionaries[field]))
+        return {name: total for name, total, count in
+                zip(table.dictionaries[field], totals.tolist(),
+                    np.bincount(codes[valid], minlength=len(totals)))
+                if count}
+    return _cached(table, ("category_totals", field, value), compute)
+
+
+def monthly_totals(table, value="minutes"):
+    """Return ``(months, totals)`` with the sum of ``value`` per calendar month.
+
+    Months are 'YYYY-MM' labels in order; months without entries between
+    the first and last one are left out.
+    """
+    def compute():
+        if not table.length:
+            return [], []
+        days = table.columns["date"][:table.length] - EPOCH_ORDINAL
+        months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first = months.min()
+        totals = np.bincount(months - first, weights=table.columns[value][:table.length])
+        counts = np.bincount(months - first)
+        present = np.flatnonzero(counts)
+        labels = (present + first).astype("datetime64[M]").astype(str).tolist()
+        return labels, totals[present].tolist()
+    return _cached(table, ("monthly_totals", value), compute)
+
+
+def food_usage(table, summaries=()):
+    """Return how often and when each food was logged in a calories table.
+
+    Maps food names to ``(times logged, last date ordinal, kcal, protein,
+    carbs, fats)``, the macros being those of the most recent entry.
+    ``summaries`` are segment totals (see ``segments.summarize``) of sealed
+    months to add; they only change along with the table. Cached on the
+    table until the next write.
+    """
+    def compute():
+        usage = {}
+        rows = table.date_rows()
+        codes = table.columns["food"][rows].astype(np.int64)
+        rows, codes = rows[codes >= 0], codes[codes >= 0]
+        if len(rows):
+            names = table.dictionaries["food"]
+            counts = np.bincount(codes, minlength=len(names))
+            # Rows are oldest first, so the first hit in reverse is the latest entry
+            found, first = np.unique(codes[::-1], return_index=True)
+            latest = rows[::-1][first]
+            columns = [table.columns["date"][latest].tolist()]
+            for field in ("intake", "protein", "carbs", "fats"):
+                columns.append(np.nan_to_num(table.columns[field][latest].astype(np.float64)).tolist())
+            usage = {names[code]: (int(counts[code]), *values)
+                     for code, *values in zip(found.tolist(), *columns)}
+        for summary in summaries:
+            for food, (count, last, *macros) in summary["foods"].items():
+                current = usage.get(food)
+                if current is None or last > current[1]:
+                    usage[food] = (count + (current[0] if current else 0), last, *macros)
+                else:
+                    usage[food] = (current[0] + count, *current[1:])
+        return usage
+    return _cached(table, "food_usage", compute)
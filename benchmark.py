@@ -0,0 +1,290 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import core
+import importer
+import views
+from columnar import CARDIO_TYPES, MUSCLE_GROUPS
+from segments import SegmentDir
+from storage import COLLECTIONS, SharedStore, open_store
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+# Share of the generated records that goes to each collection
+MIX = {"workouts": 0.4, "strength_logs": 0.3, "calories": 0.3}
+
+# Days of history the generated records are spread over, ending today
+HISTORY_DAYS = 5 * 365
+
+EXERCISES = {
+    "Chest": ["Bench Press", "Incline Press", "Chest Fly"],
+    "Shoulders": ["Overhead Press", "Lateral Raise"],
+    "Triceps": ["Dips", "Skull Crusher"],
+    "Back": ["Deadlift", "Barbell Row", "Pull Up"],
+    "Biceps": ["Barbell Curl", "Hammer Curl"],
+    "Legs": ["Squat", "Leg Press", "Lunge"],
+    "Abs": ["Plank", "Crunch"],
+}
+FOODS = ["Oatmeal", "Chicken Rice", "Salad", "Pasta", "Eggs", "Protein Shake", "Apple", "Steak"]
+
+GENERATE_CHUNK = 50_000
+
+
+def _dates(rng, count, today):
+    days = np.sort(rng.integers(0, HISTORY_DAYS, count))[::-1]
+    return pd.Series(np.datetime64(today, "D") - days.astype("timedelta64[D]")).astype("datetime64[ns]")
+
+
+def _workouts(rng, count, today):
+    categories = rng.choice(["Strength", "Cardio", "Flexibility", "Sports"], count, p=[0.5, 0.3, 0.1, 0.1])
+    minutes = rng.integers(15, 121, count).astype(np.float64)
+    frame = pd.DataFrame({
+        "date": _dates(rng, count, today),
+        "time": pd.Series(rng.integers(6, 22, count)).map("{:02d}:00:00".format),
+        "minutes": minutes,
+        "intensity": rng.choice(["Light", "Moderate", "High", "Extreme"], count),
+        "category": categories,
+        "notes": "",
+    })
+    for parent, keys, category in (("muscles", MUSCLE_GROUPS, "Strength"), ("cardio", CARDIO_TYPES, "Cardio")):
+        share = rng.dirichlet(np.ones(len(keys)), count)
+        for i, key in enumerate(keys):
+            frame[f"{parent}.{key}"] = np.where(categories == category, np.floor(share[:, i] * minutes), np.nan)
+    return frame
+
+
+def _strength_logs(rng, count, today):
+    muscles = rng.choice(MUSCLE_GROUPS, count)
+    exercises = [EXERCISES[muscle][i % len(EXERCISES[muscle])]
+                 for muscle, i in zip(muscles, rng.integers(0, 6, count))]
+    return pd.DataFrame({
+        "date": _dates(rng, count, today),
+        "exercise": exercises,
+        "muscle_group": muscles,
+        "weight": rng.integers(8, 400, count) * 0.5,
+        "reps": rng.integers(1, 16, count).astype(np.float64),
+        "sets": rng.integers(1, 6, count).astype(np.float64),
+        "rpe": rng.integers(5, 11, count).astype(np.float64),
+        "notes": "",
+    })
+
+
+def _calories(rng, count, today):
+    return pd.DataFrame({
+        "date": _dates(rng, count, today),
+        "meal_type": rng.choice(["Breakfast", "Lunch", "Dinner", "Snack"], count),
+        "food": rng.choice(FOODS, count),
+        "intake": rng.integers(50, 1200, count).astype(np.float64),
+        "protein": rng.integers(0, 800, count) / 10,
+        "carbs": rng.integers(0, 1500, count) / 10,
+        "fats": rng.integers(0, 600, count) / 10,
+        "notes": "",
+    })
+
+
+GENERATORS = {"workouts": _workouts, "strength_logs": _strength_logs, "calories": _calories}
+
+
+def generate(store, records, seed=0, today=None):
+    """Fill a store with ``records`` synthetic records split across the collections.
+
+    Records are spread over the HISTORY_DAYS days up to ``today`` and saved
+    in chunks, newest first; the same seed always gives the same data.
+    """
+    today = today or date.today()
+    rng = np.random.default_rng(seed)
+    for name in COLLECTIONS:
+        remaining = int(records * MIX[name])
+        while remaining:
+            count = min(remaining, GENERATE_CHUNK)
+            store.extend(name, importer.to_records(name, GENERATORS[name](rng, count, today)))
+            remaining -= count
+
+
+def functions(store, today):
+    """Return the core functions to time, as name -> zero-argument callable"""
+    exercise = "Bench Press"
+    return {
+        "today_stats": lambda: core.today_stats(store, today),
+        "weekly_overview": lambda: core.weekly_overview(store, today),
+        "recent_workouts": lambda: core.recent(store, "workouts", 5),
+        "muscle_totals": lambda: core.muscle_totals(store),
+        "monthly_volume": lambda: core.monthly_volume(store),
+        "category_distribution": lambda: core.category_distribution(store),
+        "weekly_report": lambda: core.weekly_report(store, today),
+        "calorie_analysis": lambda: core.calorie_analysis(store, today, 2000),
+        "daily_intake": lambda: core.daily_intake(store, today - timedelta(days=HISTORY_DAYS), today),
+        "strength_progress": lambda: core.strength_progress(store, exercise),
+    }
+
+
+def _time(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def _peak(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run(backend, size, repeats, data_dir, segments=False):
+    """Generate ``size`` records in a fresh store and time every core function.
+
+    ``cold_ms`` is the first call on a freshly loaded store, ``warm_ms``
+    the median of ``repeats`` further calls. ``peak_kb`` is the Python
+    memory peak of a call after dropping the results cached on the tables.
+    With ``segments`` closed months are sealed first (timed as "seal") and
+    the functions read their totals from the segments.
+    """
+    today = date.today()
+    start = time.perf_counter()
+    generate(SharedStore(open_store(data_dir, backend)), size, today=today)
+    results = [{"function": "generate", "ms": round((time.perf_counter() - start) * 1000, 1)}]
+
+    def open_shared():
+        return SharedStore(open_store(data_dir, backend),
+                           segments=SegmentDir(Path(data_dir) / "segments") if segments else None)
+    if segments:
+        start = time.perf_counter()
+        sealed = open_shared()
+        for name in COLLECTIONS:
+            sealed.hot(name)
+        results.append({"function": "seal", "ms": round((time.perf_counter() - start) * 1000, 1)})
+
+    store = open_shared()
+    load = lambda: [store.hot(name) for name in COLLECTIONS]
+    results.append({"function": "load", "cold_ms": round(_time(load), 3)})
+    for name, function in functions(store, today).items():
+        cold = _time(function)
+        warm = statistics.median(_time(function) for _ in range(repeats))
+        for collection in COLLECTIONS:
+            store.hot(collection).derived = {}
+        results.append({"function": name, "cold_ms": round(cold, 3), "warm_ms": round(warm, 3),
+                        "peak_kb": round(_peak(function), 1)})
+    for result in results:
+        result.update(backend=backend + ("+segments" if segments else ""), size=size)
+    return results
+
+
+# Renders the app once in a fresh interpreter with a page preselected and
+# prints the seconds from interpreter start to the end of the render
+_STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[2])
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+app.session_state["page"] = sys.argv[3]
+app.run()
+if app.exception:
+    sys.exit(str(app.exception))
+print(time.perf_counter() - start)
+"""
+
+
+def startup(pages, repeats):
+    """Time the first render of each page in a fresh process on an empty data dir.
+
+    This covers imports and module loading, so it tracks cold start and
+    time-to-first-form rather than data size.
+    """
+    root = Path(__file__).resolve().parent
+    results = []
+    for page in pages or list(views.PAGES):
+        times = []
+        for _ in range(repeats):
+            with tempfile.TemporaryDirectory() as cwd:
+                out = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT, str(root / "workout.py"),
+                                      str(root), page], cwd=cwd, capture_output=True, text=True, check=True)
+            times.append(float(out.stdout) * 1000)
+        results.append({"function": f"startup:{views.PAGES[page]}", "backend": "sqlite", "size": 0,
+                        "cold_ms": round(statistics.median(times), 1)})
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Return (result, baseline result) pairs more than ``tolerance`` times slower"""
+    previous = {(r["backend"], r["size"], r["function"]): r for r in baseline["results"]}
+    slower = []
+    for result in results:
+        old = previous.get((result["backend"], result["size"], result["function"]))
+        if old is None:
+            continue
+        for field in ("cold_ms", "warm_ms"):
+            # Sub-millisecond timings are too noisy to compare
+            if field in old and field in result and result[field] > max(old[field], 1) * tolerance:
+                slower.append((result, old, field))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the core functions on synthetic data")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="sqlite")
+    parser.add_argument("--segments", action="store_true",
+                        help="seal closed months into segments and read totals from them")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="total records per run")
+    parser.add_argument("--repeats", type=int, default=5, help="warm calls per function")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--startup", action="store_true",
+                        help="also time the first render of each page in a fresh process")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="slowdown factor reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            for result in run(args.backend, size, args.repeats, data_dir, args.segments):
+                results.append(result)
+                if "cold_ms" in result:
+                    print(f"{size:>9,} {result['function']:22} cold {result['cold_ms']:10.2f} ms"
+                          + (f"  warm {result['warm_ms']:9.3f} ms  peak {result['peak_kb']:10.1f} KiB"
+                             if "warm_ms" in result else ""))
+                else:
+                    print(f"{size:>9,} {result['function']:22} {result['ms'] / 1000:10.1f} s")
+    if args.startup:
+        for result in startup(None, args.repeats):
+            results.append(result)
+            print(f"{'':9} {result['function']:22} cold {result['cold_ms']:10.2f} ms")
+    with open(args.output, "w") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "results": results,
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for result, old, field in slower:
+            print(f"REGRESSION {result['backend']} {result['size']:,} {result['function']} {field}: "
+                  f"{old[field]:.2f} -> {result[field]:.2f} ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import numpy as np
+import plotly.express as px
+
+# Most points (or bars) a chart sends to the browser
+MAX_POINTS = 400
+
+
+def lttb(x, y, threshold=MAX_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most ``threshold`` points that keep the
+    visual shape of the series; the first and last points are always kept.
+    """
+    n = len(x)
+    if n <= threshold or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def bucket_means(x, y, buckets=MAX_POINTS):
+    """Average consecutive points into at most ``buckets`` equal-size buckets.
+
+    Returns ``(x of each bucket's first point, mean y per bucket)``; series
+    that already fit are returned unchanged.
+    """
+    n = len(x)
+    if n <= buckets:
+        return np.asarray(x), np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    sums = np.add.reduceat(np.asarray(y, dtype=np.float64), edges[:-1])
+    return np.asarray(x)[edges[:-1]], sums / np.diff(edges)
+
+
+def strength_progress_figure(exercise, dates, weights):
+    """Line chart of an exercise's top weight per day, downsampled with LTTB"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    keep = lttb(dates.astype(np.int64), weights)
+    fig = px.line(x=dates[keep], y=np.asarray(weights)[keep],
+                  title=f"{exercise} Progress", markers=len(keep) <= 100,
+                  labels={'x': 'Date', 'y': 'Weight (kg)'})
+    return fig, len(keep)
+
+
+def daily_calorie_figure(dates, intake):
+    """Bar chart of daily intake, averaged into buckets for long ranges"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    bucket_dates, bucket_intake = bucket_means(dates, intake)
+    averaged = len(bucket_dates) < len(dates)
+    fig = px.bar(x=bucket_dates, y=bucket_intake,
+                 title="Daily Calorie Intake" + (" (bucket averages)" if averaged else ""),
+                 labels={'x': 'Date', 'y': 'Calories (kcal)'},
+                 color=bucket_intake, color_continuous_scale="RdYlGn_r")
+    return fig, len(bucket_dates)
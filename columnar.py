@@ -0,0 +1,386 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+MUSCLE_GROUPS = ["Chest", "Shoulders", "Triceps", "Back", "Biceps", "Legs", "Abs"]
+CARDIO_TYPES = ["Cycling", "Treadmill", "Elliptical"]
+
+# Column layout of each collection. "date" columns hold day ordinals,
+# "category" columns hold int16 codes into a per-column dictionary
+# (int32 once it outgrows int16) and
+# "text" columns hold free-form strings.
+SCHEMAS = {
+    "workouts": {
+        "date": "date",
+        "time": "text",
+        "minutes": "int32",
+        "intensity": "category",
+        "category": "category",
+        "notes": "text",
+    },
+    "strength_logs": {
+        "date": "date",
+        "exercise": "category",
+        "muscle_group": "category",
+        "weight": "float64",
+        "reps": "int16",
+        "sets": "int16",
+        "rpe": "int8",
+        "notes": "text",
+    },
+    "calories": {
+        "date": "date",
+        "meal_type": "category",
+        "food": "category",
+        "intake": "int32",
+        "protein": "float64",
+        "carbs": "float64",
+        "fats": "float64",
+        "notes": "text",
+    },
+}
+
+# Nested per-record breakdowns, flattened to one float32 column per key
+# ("muscles.Chest"); NaN marks records without that breakdown
+NESTED = {
+    "workouts": {"muscles": MUSCLE_GROUPS, "cardio": CARDIO_TYPES},
+}
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_DTYPES = {"date": "int32", "category": "int16", "text": "object"}
+
+
+def _merge_keys(index, keys):
+    keys = np.sort(keys)
+    if not len(index) or not len(keys) or keys[0] > index[-1]:
+        return np.concatenate([index, keys])
+    return np.insert(index, np.searchsorted(index, keys), keys)
+
+
+def to_ordinal(value):
+    """Convert a date or ISO date string to a day ordinal"""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+class ColumnTable:
+    """Typed, dictionary-encoded columns for one collection.
+
+    Columns are NumPy arrays that grow by doubling, so appends are O(1)
+    amortized. Fields outside the schema are kept per row in an "extra"
+    column so records round-trip unchanged.
+    """
+
+    def __init__(self, name, capacity=64):
+        self.name = name
+        self.schema = SCHEMAS[name]
+        self.nested = NESTED.get(name, {})
+        self.length = 0
+        self.columns = {}
+        for field, kind in self.schema.items():
+            self.columns[field] = np.zeros(capacity, dtype=_DTYPES.get(kind, kind))
+        for parent, keys in self.nested.items():
+            for key in keys:
+                self.columns[f"{parent}.{key}"] = np.full(capacity, np.nan, dtype="float32")
+        self.columns["extra"] = np.empty(capacity, dtype="object")
+        self.dictionaries = {field: [] for field, kind in self.schema.items() if kind == "category"}
+        self._codes = {field: {} for field in self.dictionaries}
+        self._frame = None
+        self._index = None
+        self._groups = {}
+        # Results computed from the columns (see analytics), reset on write
+        self.derived = {}
+
+    @classmethod
+    def from_records(cls, name, records):
+        table = cls(name, capacity=max(64, len(records)))
+        table.extend(records)
+        return table
+
+    @classmethod
+    def concat(cls, name, tables):
+        """Return one table holding the rows of several, in order.
+
+        Category codes are remapped onto a merged dictionary, so the parts
+        may come from tables with different dictionaries.
+        """
+        table = cls(name, capacity=max(64, sum(part.length for part in tables)))
+        for field in list(table.columns):
+            row = 0
+            for part in tables:
+                values = part.columns[field][:part.length]
+                if field in table.dictionaries:
+                    codes = [table._encode(field, value) for value in part.dictionaries[field]]
+                    # Code -1 (no value) indexes the trailing -1
+                    lookup = np.array(codes + [-1], dtype=np.int32)
+                    values = lookup[values]
+                # Looked up per part: encoding may have widened the column
+                table.columns[field][row:row + part.length] = values
+                row += part.length
+        table.length = sum(part.length for part in tables)
+        return table
+
+    def take(self, rows):
+        """Return a new table with the given rows, keeping only the category values they use"""
+        rows = np.asarray(rows, dtype=np.int64)
+        table = ColumnTable(self.name, capacity=max(64, len(rows)))
+        for field, column in self.columns.items():
+            values = column[rows]
+            if field in self.dictionaries:
+                used, codes = np.unique(values, return_inverse=True)
+                names = self.dictionaries[field]
+                lookup = np.array([table._encode(field, names[code]) if code >= 0 else -1
+                                   for code in used.tolist()], dtype=values.dtype)
+                values = lookup[codes] if len(used) else values
+            table.columns[field][:len(rows)] = values
+        table.length = len(rows)
+        return table
+
+    def __len__(self):
+        return self.length
+
+    def _grow(self, needed):
+        capacity = len(self.columns["extra"])
+        if needed <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        for field, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.length] = column[:self.length]
+            if column.dtype.kind == "f":
+                grown[self.length:] = np.nan
+            self.columns[field] = grown
+
+    def _encode(self, field, value):
+        codes = self._codes[field]
+        if value is None:
+            return -1
+        if value not in codes:
+            code = len(self.dictionaries[field])
+            if code > np.iinfo(self.columns[field].dtype).max:
+                # Widen the column before the new code would wrap around
+                self.columns[field] = self.columns[field].astype(np.int32)
+            codes[value] = code
+            self.dictionaries[field].append(value)
+        return codes[value]
+
+    def append(self, record):
+        self.extend([record])
+
+    def extend(self, records):
+        """Append records, encoding each field into its column"""
+        records = list(records)
+        self._grow(self.length + len(records))
+        first = row = self.length
+        for record in records:
+            extra = {}
+            for field, value in record.items():
+                kind = self.schema.get(field)
+                if kind == "date":
+                    self.columns[field][row] = to_ordinal(value)
+                elif kind == "category":
+                    self.columns[field][row] = self._encode(field, value)
+                elif kind == "text":
+                    self.columns[field][row] = value
+                elif kind is not None:
+                    self.columns[field][row] = value or 0
+                elif field in self.nested and isinstance(value, dict):
+                    leftover = {}
+                    for key, amount in value.items():
+                        column = self.columns.get(f"{field}.{key}")
+                        if column is not None:
+                            column[row] = amount
+                        else:
+                            leftover[key] = amount
+                    if leftover:
+                        extra[field] = leftover
+                else:
+                    extra[field] = value
+            for field, kind in self.schema.items():
+                if field not in record and kind == "category":
+                    self.columns[field][row] = -1
+                elif field not in record and kind == "text":
+                    self.columns[field][row] = None
+                elif field not in record:
+                    self.columns[field][row] = 0
+            self.columns["extra"][row] = extra or None
+            row += 1
+        self.length = row
+        if self._index is not None:
+            self._index = _merge_keys(self._index, self._keys(first, row))
+        for (field, by), groups in self._groups.items():
+            self._add_groups(groups, field, by, first, row)
+        self._frame = None
+        self.derived = {}
+
+    def _keys(self, start, stop):
+        rows = np.arange(start, stop, dtype=np.int64)
+        return (self.columns["date"][start:stop].astype(np.int64) << 32) | rows
+
+    def date_index(self):
+        """Return every row as a ``date ordinal << 32 | row`` key, sorted.
+
+        Built on first use and then kept sorted by merging each batch of
+        appended rows, so it also serves as a keyset cursor space.
+        """
+        if self._index is None:
+            self._index = np.sort(self._keys(0, self.length))
+        return self._index
+
+    def date_rows(self, start=None, end=None):
+        """Return the rows dated within a range, oldest first, from the date index"""
+        index = self.date_index()
+        lo = 0 if start is None else int(np.searchsorted(index, to_ordinal(start) << 32))
+        hi = len(index) if end is None else int(np.searchsorted(index, (to_ordinal(end) + 1) << 32))
+        return index[lo:hi] & 0xFFFFFFFF
+
+    def page(self, limit, before=None, fields=None, start=None, **equals):
+        """Return up to ``limit`` records older than a cursor, newest first.
+
+        Walks the date index backwards from ``before`` (a key returned by a
+        previous call, or None for the newest records) testing category
+        filters as it goes, so the cost depends on the page size and filter
+        selectivity rather than on the table size. Only ``fields`` are
+        decoded when given, and with ``start`` only records dated from then
+        on. Returns ``(records, cursor)``; the cursor is None on the last
+        page.
+        """
+        index = self.date_index()
+        end = len(index) if before is None else int(np.searchsorted(index, before))
+        lo = 0 if start is None else int(np.searchsorted(index, to_ordinal(start) << 32))
+        tests = []
+        for field, value in equals.items():
+            code = self._codes[field].get(value)
+            if code is None:
+                return [], None
+            tests.append((self.columns[field], code))
+        chunks, found, size = [], 0, max(limit * 4, 256)
+        while end > lo and found <= limit:
+            first = max(lo, end - size)
+            rows = (index[first:end] & 0xFFFFFFFF)[::-1]
+            for column, code in tests:
+                rows = rows[column[rows] == code]
+            chunks.append(rows)
+            found += len(rows)
+            end, size = first, size * 2
+        rows = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+        cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursor = int(self.columns["date"][rows[-1]]) << 32 | int(rows[-1])
+        return self.records(rows, fields), cursor
+
+    def distinct(self, field, **equals):
+        """Return the sorted distinct values of a category column.
+
+        One category filter may be given (``muscle_group="Chest"``); the
+        values seen alongside each value of that column are built on first
+        use and kept up to date on append.
+        """
+        if not equals:
+            return sorted(self.dictionaries[field])
+        if len(equals) > 1:
+            raise ValueError("distinct() takes at most one filter")
+        (by, value), = equals.items()
+        groups = self._groups.get((field, by))
+        if groups is None:
+            groups = self._groups[(field, by)] = {}
+            self._add_groups(groups, field, by, 0, self.length)
+        names = self.dictionaries[field]
+        return sorted(names[code] for code in groups.get(self._codes[by].get(value), ()))
+
+    def _add_groups(self, groups, field, by, start, stop):
+        pairs = np.column_stack([self.columns[by][start:stop], self.columns[field][start:stop]])
+        for by_code, code in np.unique(pairs, axis=0).tolist():
+            if code >= 0:
+                groups.setdefault(by_code, set()).add(code)
+
+    def mask(self, start=None, end=None, **equals):
+        """Return a boolean row mask for a date range and category filters"""
+        mask = np.ones(self.length, dtype=bool)
+        dates = self.columns["date"][:self.length]
+        if start is not None:
+            mask &= dates >= to_ordinal(start)
+        if end is not None:
+            mask &= dates <= to_ordinal(end)
+        for field, value in equals.items():
+            code = self._codes[field].get(value)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.columns[field][:self.length] == code
+        return mask
+
+    def records(self, rows=None, fields=None):
+        """Decode rows (all by default) back into record dicts.
+
+        ``fields`` limits decoding to the given fields.
+        """
+        rows = np.arange(self.length) if rows is None else np.asarray(rows, dtype=np.int64)
+        out = [{} for _ in range(len(rows))]
+        for field, kind in self.schema.items():
+            if fields is not None and field not in fields:
+                continue
+            values = self.columns[field][rows]
+            if kind == "date":
+                values = [date.fromordinal(int(v)).isoformat() for v in values]
+            elif kind == "category":
+                names = self.dictionaries[field]
+                values = [names[v] if v >= 0 else None for v in values]
+            else:
+                values = values.tolist()
+            for record, value in zip(out, values):
+                record[field] = value
+        for parent, keys in self.nested.items():
+            if fields is not None and parent not in fields:
+                continue
+            block = np.column_stack([self.columns[f"{parent}.{key}"][rows] for key in keys])
+            present = ~np.isnan(block).all(axis=1)
+            for record, amounts, has_block in zip(out, block.tolist(), present):
+                if has_block:
+                    record[parent] = {key: int(a) if a == int(a) else a
+                                      for key, a in zip(keys, amounts) if not np.isnan(a)}
+        for record, extra in zip(out, self.columns["extra"][rows]):
+            if extra:
+                for field, value in extra.items():
+                    if fields is not None and field not in fields:
+                        continue
+                    if isinstance(value, dict) and isinstance(record.get(field), dict):
+                        record[field].update(value)
+                    else:
+                        record[field] = value
+        return out
+
+    def latest(self, count):
+        """Return the ``count`` most recent records, newest first"""
+        rows = self.date_index()[::-1][:count] & 0xFFFFFFFF
+        return self.records(rows)
+
+    def frame(self):
+        """Return a DataFrame over the columns, cached until the next write.
+
+        Numeric columns are passed through without copying and category
+        columns become pandas Categoricals over the stored codes. The frame
+        is shared, so callers must not modify it in place.
+        """
+        if self._frame is None:
+            n = self.length
+            data = {}
+            for field, kind in self.schema.items():
+                column = self.columns[field][:n]
+                if kind == "date":
+                    data[field] = (column - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[ns]")
+                elif kind == "category":
+                    data[field] = pd.Categorical.from_codes(column, self.dictionaries[field])
+                else:
+                    data[field] = column
+            for parent, keys in self.nested.items():
+                for key in keys:
+                    data[f"{parent}.{key}"] = self.columns[f"{parent}.{key}"][:n]
+            self._frame = pd.DataFrame(data, copy=False)
+        return self._frame
@@ -0,0 +1,141 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+import pandas as pd
+
+import analytics
+import rollups
+
+
+def today_stats(store, today):
+    """Return the rolled-up workout and calorie totals of one day"""
+    return store.daily_summary(today, today)[str(today)]
+
+
+def weekly_overview(store, today):
+    """Return workout minutes per day for the 7 days ending ``today``"""
+    summary = store.daily_summary(today - timedelta(days=6), today)
+    return pd.DataFrame({
+        "Day": [date.fromisoformat(day).strftime("%a") for day in summary],
+        "Minutes": [stats['minutes'] for stats in summary.values()]
+    })
+
+
+def recent(store, name, count):
+    """Return the ``count`` most recent records of a collection, newest first"""
+    return store.latest(name, count)
+
+
+def _add(totals, more):
+    for key, value in more.items():
+        totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def muscle_totals(store):
+    """Return total minutes per muscle group, smallest first.
+
+    Sealed months contribute their precomputed totals; only the hot rows
+    are scanned. The same holds for the other totals below.
+    """
+    totals = dict(analytics.muscle_totals(store.hot("workouts")))
+    for summary in store.summaries("workouts"):
+        _add(totals, summary["muscles"])
+    return pd.DataFrame({
+        "Muscle Group": list(totals.keys()),
+        "Minutes": list(totals.values())
+    }).sort_values("Minutes", ascending=True)
+
+
+def monthly_volume(store):
+    """Return workout minutes per calendar month"""
+    totals = dict(zip(*analytics.monthly_totals(store.hot("workouts"))))
+    for summary in store.summaries("workouts"):
+        _add(totals, {summary["month"]: summary["minutes"]})
+    months = sorted(totals)
+    return pd.DataFrame({'month': months, 'minutes': [totals[month] for month in months]})
+
+
+def category_distribution(store):
+    """Return workout minutes per workout type"""
+    totals = dict(analytics.category_totals(store.hot("workouts")))
+    for summary in store.summaries("workouts"):
+        _add(totals, summary["categories"])
+    return pd.DataFrame({'category': list(totals), 'minutes': list(totals.values())})
+
+
+def weekly_report(store, today, weeks=4):
+    """Return workouts, minutes and average duration of the last ``weeks`` weeks.
+
+    Weeks start on Monday; the current week comes first.
+    """
+    this_week_start = today - timedelta(days=today.weekday())
+    summary = store.daily_summary(this_week_start - timedelta(days=7 * (weeks - 1)),
+                                  this_week_start + timedelta(days=6))
+    rows = []
+    for week in range(weeks):
+        week_start = this_week_start - timedelta(days=7 * week)
+        week_end = week_start + timedelta(days=6)
+        week_days = [summary[str(week_start + timedelta(days=i))] for i in range(7)]
+        total_minutes = sum(day['minutes'] for day in week_days)
+        workouts_count = sum(day['sessions'] for day in week_days)
+        rows.append({
+            'Week': f"{week_start.strftime('%b %d')} - {week_end.strftime('%b %d')}",
+            'Workouts': workouts_count,
+            'Total Minutes': total_minutes,
+            'Avg Duration': total_minutes / workouts_count if workouts_count > 0 else 0
+        })
+    return pd.DataFrame(rows)
+
+
+def calorie_analysis(store, today, daily_goal):
+    """Return today's intake and macros plus the rolling averages against a goal.
+
+    ``macro_kcal`` holds the calories from protein, carbs and fats; ``rolling``
+    has one row per window in ``rollups.WINDOWS``.
+    """
+    stats = today_stats(store, today)
+    windows = store.rolling("calories", today)
+    rolling = []
+    for window in rollups.WINDOWS:
+        means = windows.means(window)
+        rolling.append({
+            'Window': f"Last {window} days",
+            'Total (kcal)': windows.totals(window)['intake'],
+            'Avg/day (kcal)': round(means['intake']),
+            'Net vs goal (kcal/day)': round(means['intake'] - daily_goal),
+            'Protein/day (g)': round(means['protein'], 1),
+            'Carbs/day (g)': round(means['carbs'], 1),
+            'Fats/day (g)': round(means['fats'], 1),
+        })
+    return {
+        'intake': stats['intake'],
+        'protein': stats['protein'],
+        'carbs': stats['carbs'],
+        'fats': stats['fats'],
+        'macro_kcal': {'Protein': stats['protein'] * 4, 'Carbs': stats['carbs'] * 4,
+                       'Fats': stats['fats'] * 9},
+        'rolling': pd.DataFrame(rolling),
+    }
+
+
+def daily_intake(store, start, end):
+    """Return ``(days, intake)`` for the days in a range with at least one meal"""
+    summary = store.daily_summary(start, end)
+    days = [day for day, totals in summary.items() if totals['meals']]
+    return days, [summary[day]['intake'] for day in days]
+
+
+def strength_progress(store, exercise, start=None, end=None):
+    """Return ``(days, weights)``: an exercise's top weight per training day in a range"""
+    records = store.personal_records(exercise)
+    progress = records['progress'] if records else []
+    days = [day for day, _ in progress]
+    lo = 0 if start is None else bisect_left(days, str(start))
+    hi = len(days) if end is None else bisect_right(days, str(end))
+    return days[lo:hi], [weight for _, weight in progress[lo:hi]]
+
+
+def food_usage(store):
+    """Return how often and when each food was logged (see ``analytics.food_usage``)"""
+    return analytics.food_usage(store.hot("calories"), store.summaries("calories"))
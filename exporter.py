@@ -0,0 +1,184 @@
+import argparse
+import gzip
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import importer
+from storage import COLLECTIONS, SharedStore, existing_users, open_store, user_dir
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Records decoded and written per batch
+CHUNK_SIZE = 10_000
+
+FORMATS = ["ndjson", "csv"] + (["parquet"] if pq is not None else [])
+COMPRESSIONS = ["gzip", "none"] + (["zstd"] if zstandard is not None else [])
+
+_encoder = json.JSONEncoder(default=str)
+
+
+def filename(name, fmt, compression):
+    """Return the archive member name of an exported collection"""
+    if fmt == "parquet" or compression == "none":
+        return f"{name}.{fmt}"
+    return f"{name}.{fmt}.{'gz' if compression == 'gzip' else 'zst'}"
+
+
+class _Unclosable(io.RawIOBase):
+    """Writable wrapper that leaves the wrapped file open on close"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.out.write(data)
+
+
+def _compressed(out, compression):
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().stream_writer(out, closefd=False)
+    return _Unclosable(out)
+
+
+def _write_ndjson(store, name, out, start, end, chunk_size):
+    for records in store.iter_records(name, chunk_size, start, end):
+        out.write("".join(_encoder.encode(record) + "\n" for record in records).encode())
+
+
+def _write_csv(store, name, out, start, end, chunk_size):
+    header = True
+    for frame in store.iter_frames(name, chunk_size, start, end):
+        out.write(frame.to_csv(index=False, header=header, date_format="%Y-%m-%d").encode())
+        header = False
+    if header:
+        columns = store.frame(name).columns
+        out.write((",".join(columns) + "\n").encode())
+
+
+def _write_parquet(store, name, out, start, end, chunk_size, compression):
+    schema = pa.Schema.from_pandas(store.frame(name).iloc[:0], preserve_index=False)
+    # Text columns have no values to infer a type from in the empty frame
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    codec = {"none": "none", "gzip": "gzip", "zstd": "zstd"}[compression]
+    with pq.ParquetWriter(out, schema, compression=codec) as writer:
+        for frame in store.iter_frames(name, chunk_size, start, end):
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+
+
+def write_collection(store, name, out, fmt="ndjson", compression="gzip",
+                     start=None, end=None, chunk_size=CHUNK_SIZE):
+    """Stream one collection of a SharedStore into a binary file object.
+
+    Records dated between ``start`` and ``end`` are written oldest first,
+    ``chunk_size`` at a time. NDJSON keeps every field; CSV and Parquet
+    have one column per schema field plus flattened breakdowns
+    ("muscles.Chest"). Parquet uses its own column compression instead of
+    wrapping the file.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    if fmt == "parquet":
+        _write_parquet(store, name, out, start, end, chunk_size, compression)
+        return
+    with _compressed(out, compression) as stream:
+        if fmt == "ndjson":
+            _write_ndjson(store, name, stream, start, end, chunk_size)
+        else:
+            _write_csv(store, name, stream, start, end, chunk_size)
+
+
+def export_archive(store, out, fmt="ndjson", compression="gzip", start=None, end=None,
+                   names=COLLECTIONS, chunk_size=CHUNK_SIZE):
+    """Write a zip archive with one file per collection plus the profile.
+
+    Members are written straight into the archive as they are produced, so
+    ``out`` can be a temporary file and the export never has to fit in
+    memory.
+    """
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as archive:
+        for name in names:
+            with archive.open(filename(name, fmt, compression), "w", force_zip64=True) as member:
+                write_collection(store, name, member, fmt, compression, start, end, chunk_size)
+        archive.writestr("user_data.json", json.dumps(store.load_user_data(), indent=2))
+
+
+def _decompressed(source, suffix):
+    if suffix == ".gz":
+        return gzip.GzipFile(fileobj=source, mode="rb")
+    if suffix == ".zst":
+        if zstandard is None:
+            raise ValueError("Reading .zst files needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(source)
+    return source
+
+
+def import_archive(store, source, progress=None):
+    """Import an archive written by ``export_archive`` into a store.
+
+    Collections go through the bulk importer, so records that were already
+    stored are skipped, while repeated entries within the archive (two
+    identical meals on one day) are all kept. Returns the importer totals
+    per collection.
+    """
+    results = {}
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            path = Path(info.filename)
+            name, *suffixes = path.name.split(".")
+            if path.name == "user_data.json":
+                user_data = json.loads(archive.read(info))
+                if user_data:
+                    store.save_user_data(user_data)
+                continue
+            if name not in COLLECTIONS or not suffixes:
+                continue
+            with archive.open(info) as member:
+                stream = _decompressed(member, f".{suffixes[-1]}")
+                results[name] = importer.import_file(store, name, stream, suffixes[0],
+                                                     progress=progress, keep_repeats=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a profile's data as a zip archive")
+    parser.add_argument("path", help="archive to write")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="gzip")
+    parser.add_argument("--start", help="first date to export (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last date to export (YYYY-MM-DD)")
+    parser.add_argument("--data-dir", default="workout_data")
+    parser.add_argument("--user", default="default", help="profile to export")
+    args = parser.parse_args()
+
+    try:
+        user, = existing_users(args.data_dir, [args.user])
+    except ValueError as exc:
+        parser.error(str(exc))
+    store = SharedStore(open_store(user_dir(args.data_dir, user)))
+    with open(args.path, "wb") as out:
+        export_archive(store, out, args.format, args.compression, args.start, args.end)
+    print(f"Wrote {args.path} ({Path(args.path).stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import csv
+import math
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+
+# Foods shipped with the app; users add theirs to a foods.csv in the data dir
+BUNDLED_CATALOG = Path(__file__).with_name("foods.csv")
+FIELDS = ["name", "serving", "kcal", "protein", "carbs", "fats"]
+
+# Shortest word-prefix matches checked against every query word per search
+MAX_CANDIDATES = 2000
+
+# Foods logged within this many days get the full recency boost
+RECENT_DAYS = 30
+
+_separators = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Lowercase a food name and reduce punctuation to single spaces"""
+    return _separators.sub(" ", str(text).lower()).strip()
+
+
+def trigrams(key):
+    """Return the distinct 3-letter sequences of a normalized name, padded at word starts"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FoodCatalog:
+    """Foods with per-serving macros behind prefix and trigram indexes.
+
+    Names are kept in a sorted list (whole-name prefixes) and a sorted list
+    of their words (word prefixes); both are searched by bisection. Each
+    trigram maps to a compact array of food ids for fuzzy matches. Adding a
+    food with an existing name replaces its serving and macros.
+
+    One catalog is shared by every session: adding and searching hold a
+    lock, since a search reads the id arrays through numpy views and the
+    arrays cannot grow while those exist.
+    """
+
+    def __init__(self):
+        self.foods = []
+        self._keys = []
+        self._ids = {}
+        self._name_keys = []
+        self._name_ids = array("i")
+        self._word_keys = []
+        self._word_ids = array("i")
+        self._trigrams = {}
+        self._trigram_counts = array("i")
+        self._lengths = array("i")
+        self._usage_cache = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.foods)
+
+    def _new_food(self, key, food):
+        # The id arrays first: the food only becomes visible once they are in place
+        food_id = len(self.foods)
+        grams = trigrams(key)
+        for gram in grams:
+            self._trigrams.setdefault(gram, array("i")).append(food_id)
+        self._trigram_counts.append(len(grams))
+        self._lengths.append(len(key))
+        self.foods.append(food)
+        self._keys.append(key)
+        self._ids[key] = food_id
+        return food_id
+
+    def add(self, name, serving, kcal, protein, carbs, fats):
+        """Add or replace one food, keeping the indexes sorted"""
+        key = normalize(name)
+        if not key:
+            raise ValueError("A food needs a name")
+        food = {"name": str(name).strip(), "serving": str(serving).strip(), "kcal": float(kcal),
+                "protein": float(protein), "carbs": float(carbs), "fats": float(fats)}
+        with self._lock:
+            if key in self._ids:
+                self.foods[self._ids[key]] = food
+                return
+            food_id = self._new_food(key, food)
+            i = bisect_left(self._name_keys, key)
+            self._name_keys.insert(i, key)
+            self._name_ids.insert(i, food_id)
+            for word in set(key.split()):
+                i = bisect_left(self._word_keys, word)
+                self._word_keys.insert(i, sys.intern(word))
+                self._word_ids.insert(i, food_id)
+
+    def extend(self, rows):
+        """Add many foods (dicts with FIELDS) and sort the indexes once"""
+        with self._lock:
+            names, words = [], []
+            for row in rows:
+                key = normalize(row["name"])
+                if not key:
+                    continue
+                food = {"name": str(row["name"]).strip(), "serving": str(row.get("serving", "")).strip()}
+                for field in FIELDS[2:]:
+                    food[field] = float(row.get(field) or 0)
+                if key in self._ids:
+                    self.foods[self._ids[key]] = food
+                    continue
+                food_id = self._new_food(key, food)
+                names.append((key, food_id))
+                words.extend((sys.intern(word), food_id) for word in set(key.split()))
+            if names:
+                names = sorted(names + list(zip(self._name_keys, self._name_ids)))
+                self._name_keys = [key for key, _ in names]
+                self._name_ids = array("i", [food_id for _, food_id in names])
+                words = sorted(words + list(zip(self._word_keys, self._word_ids)))
+                self._word_keys = [word for word, _ in words]
+                self._word_ids = array("i", [food_id for _, food_id in words])
+
+    def load_csv(self, path):
+        """Add the foods of a CSV file with FIELDS as columns, if it exists"""
+        path = Path(path)
+        if path.exists():
+            with open(path, newline="", encoding="utf-8") as f:
+                self.extend(csv.DictReader(f))
+
+    def get(self, name):
+        """Return the food with this name, or None"""
+        with self._lock:
+            food_id = self._ids.get(normalize(name))
+            return None if food_id is None else self.foods[food_id]
+
+    def _prefix_range(self, keys, prefix):
+        lo = bisect_left(keys, prefix)
+        return lo, bisect_left(keys, prefix + "\uffff", lo)
+
+    def _shortest(self, ids, count):
+        """Return the ``count`` ids with the shortest names, ties in their given order"""
+        if len(ids) > count:
+            lengths = np.frombuffer(self._lengths, dtype=np.int32)[ids].astype(np.int64)
+            order = (lengths << 32) | np.arange(len(ids))
+            ids = ids[np.sort(np.argpartition(order, count)[:count])]
+        return ids.tolist()
+
+    def _candidates(self, key, wanted):
+        """Return {food id: match score}: 3 for a name prefix, 2 for word prefixes.
+
+        Prefix matches are taken shortest name first, up to ``wanted`` of
+        each kind. Only when fewer are found are the closest trigram
+        matches added, scored by their similarity (0-1).
+        """
+        found = {}
+        lo, hi = self._prefix_range(self._name_keys, key)
+        for food_id in self._shortest(np.frombuffer(self._name_ids, dtype=np.int32)[lo:hi], wanted):
+            found[food_id] = 3.0
+        words = key.split()
+        lo, hi = self._prefix_range(self._word_keys, max(words, key=len))
+        added = 0
+        for food_id in self._shortest(np.frombuffer(self._word_ids, dtype=np.int32)[lo:hi], MAX_CANDIDATES):
+            if food_id not in found and _has_word_prefixes(self._keys[food_id], words):
+                found[food_id] = 2.0
+                added += 1
+                if added == wanted:
+                    break
+        if len(found) < wanted and len(key) >= 3:
+            grams = trigrams(key)
+            postings = [np.frombuffer(self._trigrams[gram], dtype=np.int32)
+                        for gram in grams if gram in self._trigrams]
+            if postings:
+                shared = np.bincount(np.concatenate(postings), minlength=len(self.foods))
+                counts = np.frombuffer(self._trigram_counts, dtype=np.int32)
+                similarity = shared / (len(grams) + counts - shared)
+                top = np.argpartition(-similarity, min(50, len(self.foods) - 1))[:50]
+                for food_id in top.tolist():
+                    if similarity[food_id] >= 0.3:
+                        found.setdefault(food_id, float(similarity[food_id]))
+        return found
+
+    def _usage_keys(self, usage):
+        """Merge a usage dict by normalized name; memoized per usage dict"""
+        cached = self._usage_cache
+        if cached is not None and cached[0] is usage:
+            return cached[1]
+        merged = {}
+        for name, (count, last, *macros) in usage.items():
+            key = normalize(name)
+            if not key:
+                continue
+            previous = merged.get(key)
+            if previous is None or last >= previous[2]:
+                merged[key] = (name, count + (previous[1] if previous else 0), last, macros)
+            else:
+                merged[key] = (previous[0], previous[1] + count, previous[2], previous[3])
+        self._usage_cache = (usage, merged)
+        return merged
+
+    def search(self, query, limit=8, usage=None, today=None):
+        """Return up to ``limit`` foods matching a query, best first.
+
+        ``usage`` maps logged food names to ``(times logged, last date
+        ordinal, kcal, protein, carbs, fats)`` from one user's meal log (see
+        ``analytics.food_usage``). Foods the user logs often or recently
+        rank higher, and logged foods missing from the catalog are offered
+        with the macros they were last logged with. An empty query returns
+        the user's recent and frequent foods.
+        """
+        key = normalize(query)
+        words = key.split()
+        with self._lock:
+            used = self._usage_keys(usage) if usage else {}
+            scored = {}
+            if key:
+                for food_id, score in self._candidates(key, limit).items():
+                    scored[self._keys[food_id]] = (score, self.foods[food_id])
+            for name_key, (name, count, last, macros) in used.items():
+                if name_key in scored:
+                    continue
+                if key and not _has_word_prefixes(name_key, words):
+                    continue
+                food_id = self._ids.get(name_key)
+                if food_id is not None:
+                    food = self.foods[food_id]
+                else:
+                    food = {"name": name, "serving": "as last logged",
+                            **dict(zip(FIELDS[2:], macros))}
+                scored[name_key] = (3.0 if name_key.startswith(key) else 2.0, food)
+        today_ordinal = today.toordinal() if today is not None else None
+        results = []
+        for name_key, (score, food) in scored.items():
+            count, boost = 0, 0.0
+            if name_key in used:
+                _, count, last, _ = used[name_key]
+                boost = 0.5 * math.log1p(count)
+                if today_ordinal is not None and today_ordinal - last <= RECENT_DAYS:
+                    boost += 1.0
+            results.append((-(score + boost), len(name_key), name_key, {**food, "times_logged": count}))
+        results.sort(key=lambda result: result[:3])
+        return [result[3] for result in results[:limit]]
+
+
+def _has_word_prefixes(name_key, words):
+    """Whether every query word starts some word of the name"""
+    name_words = name_key.split()
+    return all(any(word.startswith(part) for word in name_words) for part in words)
+
+
+def load_catalog(*extra):
+    """Return the bundled catalog extended with any CSV files given"""
+    catalog = FoodCatalog()
+    catalog.load_csv(BUNDLED_CATALOG)
+    for path in extra:
+        catalog.load_csv(path)
+    return catalog
+
+
+def save_food(path, food):
+    """Append one food to a user catalog CSV, writing the header if needed"""
+    path = Path(path)
+    new = not path.exists()
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        if new:
+            writer.writeheader()
+        writer.writerow(food)
+
@@ -0,0 +1,289 @@
+import argparse
+import math
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from columnar import NESTED, SCHEMAS
+from storage import SharedStore, existing_users, open_store, user_dir
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Rows read, validated and saved per batch
+CHUNK_SIZE = 50_000
+
+# Column names used by other trackers, mapped to ours
+COLUMN_ALIASES = {
+    "workouts": {"duration": "minutes", "type": "category", "workout_type": "category"},
+    "strength_logs": {"exercise_name": "exercise", "muscle": "muscle_group", "kg": "weight"},
+    "calories": {"calories": "intake", "kcal": "intake", "food_item": "food", "meal": "meal_type"},
+}
+
+# Fields a row must have to be imported; other numbers default to 0
+REQUIRED_FIELDS = {
+    "workouts": ["date", "minutes"],
+    "strength_logs": ["date", "exercise", "weight", "reps"],
+    "calories": ["date", "intake"],
+}
+
+# Values used for missing category fields
+CATEGORY_DEFAULTS = {
+    "intensity": "Moderate",
+    "category": "Other",
+    "muscle_group": "Other",
+    "meal_type": "Snack",
+}
+
+# Largest value each integer field holds in memory; larger ones would wrap around
+MAX_VALUES = {name: {field: int(np.iinfo(kind).max)
+                     for field, kind in schema.items() if kind.startswith("int")}
+              for name, schema in SCHEMAS.items()}
+
+# Fields that identify a record when looking for duplicates
+KEY_FIELDS = {name: [field for field in schema if field != "notes"] for name, schema in SCHEMAS.items()}
+
+
+def read_chunks(source, fmt, chunk_size=CHUNK_SIZE):
+    """Yield DataFrames of up to ``chunk_size`` rows from a CSV, NDJSON or Parquet file"""
+    if fmt == "csv":
+        return pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False,
+                           na_values=[""])
+    if fmt == "ndjson":
+        return pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False,
+                            convert_dates=False)
+    if fmt == "parquet" and pq is not None:
+        return (batch.to_pandas() for batch in pq.ParquetFile(source).iter_batches(chunk_size))
+    raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _expand_nested(name, df):
+    """Turn nested dict columns ("muscles") into flat ones ("muscles.Chest")"""
+    for parent in NESTED.get(name, {}):
+        if parent in df.columns:
+            values = df.pop(parent)
+            is_dict = values.map(lambda value: isinstance(value, dict))
+            nested = pd.DataFrame(values.where(is_dict, None).map(lambda v: v or {}).tolist(),
+                                  index=df.index)
+            for key in nested.columns:
+                df[f"{parent}.{key}"] = nested[key]
+    return df
+
+
+def normalize(name, df):
+    """Validate a chunk and coerce it to a collection's schema.
+
+    Returns ``(frame, invalid)``: the valid rows with one column per schema
+    field (dates as datetime64, numbers as float64, text as str) plus any
+    flattened nested columns, and the number of rows dropped. Numbers must
+    be between 0 and the field's ``MAX_VALUES`` entry. All checks are
+    column-wise.
+    """
+    nested = {f"{parent}.{key}".lower(): f"{parent}.{key}"
+              for parent, keys in NESTED.get(name, {}).items() for key in keys}
+    df = df.rename(columns=lambda column: str(column).strip().lower().replace(" ", "_"))
+    df = df.rename(columns=nested)
+    for alias, field in COLUMN_ALIASES[name].items():
+        if alias in df.columns:
+            values = df.pop(alias)
+            df[field] = df[field].fillna(values) if field in df.columns else values
+    df = _expand_nested(name, df)
+    valid = np.ones(len(df), dtype=bool)
+    out = pd.DataFrame(index=df.index)
+    for field, kind in SCHEMAS[name].items():
+        required = field in REQUIRED_FIELDS[name]
+        # A missing required column makes every row of the chunk invalid
+        column = df[field] if field in df.columns else pd.Series(np.nan, index=df.index)
+        if kind == "date":
+            values = pd.to_datetime(column, errors="coerce").dt.normalize()
+            valid &= values.notna().to_numpy()
+        elif kind in ("text", "category"):
+            text = column.astype(str).str.strip()
+            present = column.notna() & (text != "")
+            if required:
+                valid &= present.to_numpy()
+            values = text.where(present, CATEGORY_DEFAULTS.get(field, ""))
+        else:
+            values = pd.to_numeric(column, errors="coerce").astype("float64")
+            if required:
+                valid &= values.notna().to_numpy()
+            values = values.fillna(0)
+            valid &= ((values >= 0) & (values <= MAX_VALUES[name].get(field, np.inf))).to_numpy()
+        out[field] = values
+    for parent, keys in NESTED.get(name, {}).items():
+        for key in keys:
+            column = f"{parent}.{key}"
+            if column in df.columns:
+                out[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    return out[valid], int((~valid).sum())
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def normalize_records(name, records):
+    """Validate record dicts and coerce them to the storage format.
+
+    Applies the same aliases, defaults and checks as ``normalize`` but one
+    dict at a time, which is much cheaper than building a DataFrame for a
+    small batch. Dates must be ISO strings (or dates). Returns
+    ``(records, invalid)``.
+    """
+    aliases = COLUMN_ALIASES[name]
+    valid, invalid = [], 0
+    for raw in records:
+        raw = {str(key).strip().lower().replace(" ", "_"): value for key, value in raw.items()}
+        for alias, field in aliases.items():
+            if raw.get(field) is None and raw.get(alias) is not None:
+                raw[field] = raw[alias]
+        record = {}
+        try:
+            record["date"] = str(date.fromisoformat(str(raw.get("date"))[:10]))
+        except ValueError:
+            invalid += 1
+            continue
+        for field, kind in SCHEMAS[name].items():
+            if kind == "date":
+                continue
+            required = field in REQUIRED_FIELDS[name]
+            value = raw.get(field)
+            if kind in ("text", "category"):
+                text = "" if value is None else str(value).strip()
+                if not text and required:
+                    break
+                record[field] = text or CATEGORY_DEFAULTS.get(field, "")
+            else:
+                number = _number(value)
+                if number is None and required:
+                    break
+                if number is not None and not 0 <= number <= MAX_VALUES[name].get(field, math.inf):
+                    break
+                number = number or 0.0
+                record[field] = number if kind == "float64" else int(number)
+        else:
+            for parent, keys in NESTED.get(name, {}).items():
+                values = raw.get(parent)
+                if isinstance(values, dict):
+                    numbers = {key: _number(values.get(key)) for key in keys}
+                    numbers = {key: number for key, number in numbers.items() if number is not None}
+                    if numbers:
+                        record[parent] = numbers
+            valid.append(record)
+            continue
+        invalid += 1
+    return valid, invalid
+
+
+def record_hashes(name, frame):
+    """Return a uint64 hash per row of the fields that identify a record"""
+    keys = pd.DataFrame(index=frame.index)
+    for field in KEY_FIELDS[name]:
+        kind = SCHEMAS[name][field]
+        column = frame[field]
+        if kind == "date":
+            keys[field] = column.to_numpy().astype("datetime64[D]").astype(np.int64)
+        elif kind in ("text", "category"):
+            keys[field] = column.astype(object).where(column.notna(), "").astype(str)
+        else:
+            keys[field] = column.astype("float64")
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def to_records(name, frame):
+    """Convert a normalized chunk to record dicts in the storage format"""
+    data = {"date": frame["date"].dt.strftime("%Y-%m-%d").tolist()}
+    for field, kind in SCHEMAS[name].items():
+        if kind == "date":
+            continue
+        column = frame[field]
+        if kind in ("text", "category", "float64"):
+            data[field] = column.tolist()
+        else:
+            data[field] = column.astype(np.int64).tolist()
+    fields = list(data)
+    records = [dict(zip(fields, values)) for values in zip(*data.values())]
+    for parent, keys in NESTED.get(name, {}).items():
+        columns = [f"{parent}.{key}" for key in keys if f"{parent}.{key}" in frame.columns]
+        if not columns:
+            continue
+        block = frame[columns].to_numpy()
+        present = ~np.isnan(block)
+        for row in np.flatnonzero(present.any(axis=1)):
+            records[row][parent] = {column.split(".", 1)[1]: float(block[row, i])
+                                    for i, column in enumerate(columns) if present[row, i]}
+    return records
+
+
+def import_file(store, name, source, fmt, chunk_size=CHUNK_SIZE, progress=None,
+                keep_repeats=False):
+    """Stream a CSV/NDJSON/Parquet file into one collection of a store.
+
+    Each chunk is validated, deduplicated against the stored records and
+    the rows imported so far, and saved with one group write. With
+    ``keep_repeats`` only rows matching records stored before the import
+    are skipped, so a backup restores identical entries unchanged.
+    ``progress`` is called after every chunk with the running totals.
+    Returns the totals as a dict: rows read, imported, duplicates and
+    invalid.
+    """
+    seen = np.unique(record_hashes(name, store.frame(name)))
+    totals = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+    for chunk in read_chunks(source, fmt, chunk_size):
+        frame, invalid = normalize(name, chunk)
+        hashes = record_hashes(name, frame)
+        is_new = np.zeros(len(frame), dtype=bool)
+        if keep_repeats:
+            is_new[:] = True
+        else:
+            _, first = np.unique(hashes, return_index=True)
+            is_new[first] = True
+        is_new &= ~np.isin(hashes, seen, assume_unique=False)
+        records = to_records(name, frame[is_new])
+        if records:
+            store.extend(name, records)
+            if not keep_repeats:
+                seen = np.union1d(seen, hashes[is_new])
+        totals["read"] += len(chunk)
+        totals["imported"] += len(records)
+        totals["duplicates"] += len(frame) - len(records)
+        totals["invalid"] += invalid
+        if progress is not None:
+            progress(totals)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a CSV or NDJSON file into the tracker")
+    parser.add_argument("collection", choices=list(SCHEMAS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"],
+                        help="file format (default: from the file extension)")
+    parser.add_argument("--data-dir", default="workout_data")
+    parser.add_argument("--user", default="default", help="profile to import into")
+    args = parser.parse_args()
+
+    try:
+        user, = existing_users(args.data_dir, [args.user])
+    except ValueError as exc:
+        parser.error(str(exc))
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    store = SharedStore(open_store(user_dir(args.data_dir, user)))
+    start = time.perf_counter()
+    totals = import_file(store, args.collection, args.path, fmt,
+                         progress=lambda totals: print(f"{totals['read']:>10,} rows read", end="\r"))
+    print(f"{totals['read']:,} rows read: {totals['imported']:,} imported, "
+          f"{totals['duplicates']:,} duplicates, {totals['invalid']:,} invalid "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import importer
+from columnar import SCHEMAS
+from storage import DEFAULT_USER, SharedStore, open_store, user_dir, user_id
+
+# Records queued or being saved before new uploads have to wait
+QUEUE_LIMIT = 50_000
+
+# Most records taken off the queue for one round of writes
+MAX_BATCH = 10_000
+
+# Seconds an upload waits for room in the queue before it is refused with 503
+QUEUE_TIMEOUT = 1.0
+
+# Largest request body accepted, in bytes
+MAX_BODY = 16 * 1024 * 1024
+
+
+class Upload:
+    """Records of one collection from one request, waiting to be saved"""
+
+    def __init__(self, user, name, records):
+        self.user = user
+        self.name = name
+        self.records = records
+        self.error = None
+        self.done = threading.Event()
+
+
+class GroupCommitter:
+    """Queue uploaded records and save them from a single writer thread.
+
+    Whatever is queued when the writer gets to it (up to ``max_batch``
+    records) is grouped by user and collection and saved with one
+    ``store.extend`` per group, so a single transaction covers many
+    uploads. ``submit`` waits while ``limit`` records are queued or being
+    saved, and gives up after a timeout so the client can retry later.
+    """
+
+    def __init__(self, get_store, limit=QUEUE_LIMIT, max_batch=MAX_BATCH):
+        self.get_store = get_store
+        self.limit = limit
+        self.max_batch = max_batch
+        self.stats = {"uploads": 0, "records": 0, "commits": 0, "rejected": 0, "failed": 0}
+        self._pending = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+        self._thread.start()
+
+    def queued(self):
+        """Return the number of records queued or being saved"""
+        with self._cond:
+            return self._size
+
+    def submit(self, uploads, timeout=QUEUE_TIMEOUT):
+        """Queue uploads together; return False if there was no room within ``timeout``"""
+        count = sum(len(upload.records) for upload in uploads)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # An upload larger than the whole limit still gets in once the queue is empty
+            while self._size and self._size + count > self.limit:
+                remaining = deadline - time.monotonic()
+                if self._closed or remaining <= 0:
+                    self.stats["rejected"] += 1
+                    return False
+                self._cond.wait(remaining)
+            self._pending.extend(uploads)
+            self._size += count
+            self._cond.notify_all()
+        return True
+
+    def _take(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            batch, count = [], 0
+            while self._pending:
+                if batch and count + len(self._pending[0].records) > self.max_batch:
+                    break
+                upload = self._pending.popleft()
+                batch.append(upload)
+                count += len(upload.records)
+            return batch, count
+
+    def _run(self):
+        while True:
+            batch, count = self._take()
+            if not batch:
+                return
+            groups = {}
+            for upload in batch:
+                groups.setdefault((upload.user, upload.name), []).append(upload)
+            for (user, name), uploads in groups.items():
+                try:
+                    records = [record for upload in uploads for record in upload.records]
+                    self.get_store(user).extend(name, records)
+                except Exception as exc:
+                    for upload in uploads:
+                        upload.error = exc
+                for upload in uploads:
+                    upload.done.set()
+            with self._cond:
+                self._size -= count
+                self.stats["commits"] += len(groups)
+                for upload in batch:
+                    key = "failed" if upload.error else "uploads"
+                    self.stats[key] += 1
+                    if not upload.error:
+                        self.stats["records"] += len(upload.records)
+                self._cond.notify_all()
+
+    def close(self):
+        """Save what is still queued, then stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+def parse_upload(body):
+    """Validate a request body and return ``(user, {collection: records}, {collection: invalid})``.
+
+    The body is a JSON object with an optional ``user`` and a list of
+    records per collection, in the same dict format the app saves. Records
+    are checked and coerced like imported rows; invalid ones are dropped
+    and counted. Raises ValueError for a malformed body.
+    """
+    try:
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Body is not valid JSON: {exc}") from None
+    if not isinstance(data, dict):
+        raise ValueError("Body must be a JSON object")
+    user = user_id(str(data.pop("user", None) or DEFAULT_USER))
+    unknown = set(data) - set(SCHEMAS)
+    if unknown:
+        raise ValueError(f"Unknown collections: {', '.join(sorted(unknown))}")
+    collections, invalid = {}, {}
+    for name, records in data.items():
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValueError(f"{name} must be a list of records")
+        if not records:
+            continue
+        collections[name], invalid[name] = importer.normalize_records(name, records)
+    return user, collections, invalid
+
+
+class IngestHandler(BaseHTTPRequestHandler):
+    """``POST /v1/records`` queues records; ``GET /v1/stats`` reports the writer's counters.
+
+    A POST is answered once its records are saved, with the number saved
+    and dropped as invalid per collection. When the queue stays full the
+    answer is 503 with a Retry-After header and nothing is saved.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Buffer each reply so headers and body leave in one packet; written
+    # separately, Nagle's algorithm holds the body back for a delayed ACK
+    wbufsize = -1
+
+    def _reply(self, status, data, headers=()):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for header in headers:
+            self.send_header(*header)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/v1/stats":
+            return self._reply(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+        committer = self.server.committer
+        self._reply(HTTPStatus.OK, {**committer.stats, "queued": committer.queued()})
+
+    def do_POST(self):
+        if self.path != "/v1/records":
+            return self._reply(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self.close_connection = True
+            return self._reply(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                               {"error": f"Bodies are limited to {MAX_BODY} bytes"})
+        try:
+            user, collections, invalid = parse_upload(self.rfile.read(length))
+        except ValueError as exc:
+            return self._reply(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+        uploads = [Upload(user, name, records) for name, records in collections.items() if records]
+        if not self.server.committer.submit(uploads):
+            return self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many records queued"},
+                               [("Retry-After", "1")])
+        for upload in uploads:
+            upload.done.wait()
+        errors = [str(upload.error) for upload in uploads if upload.error]
+        if errors:
+            return self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "; ".join(errors)})
+        saved = {name: len(records) for name, records in collections.items()}
+        self._reply(HTTPStatus.OK, {"user": user, "saved": saved, "invalid": invalid})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def parse_address(text):
+    """Turn "8765", "host:8765" or "unix:/path/ingest.sock" into a server address"""
+    if text.startswith("unix:"):
+        return text[len("unix:"):]
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def start(address, get_store, **committer_options):
+    """Serve the ingest API from a background thread and return the server.
+
+    ``address`` is a (host, port) pair or a Unix socket path. ``get_store``
+    maps a user id to the SharedStore records are saved to; when it returns
+    the stores the app renders from, new records show up on the next
+    render. ``server.close()`` stops serving and saves what is queued.
+    """
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.unlink(address)
+        server = _UnixServer(address, IngestHandler)
+    else:
+        server = _TCPServer(address, IngestHandler)
+    server.committer = GroupCommitter(get_store, **committer_options)
+    thread = threading.Thread(target=server.serve_forever, name="ingest-server", daemon=True)
+    thread.start()
+
+    def close():
+        server.shutdown()
+        server.server_close()
+        server.committer.close()
+    server.close = close
+    return server
+
+
+def store_opener(data_dir, backend=None):
+    """Return a get_store function opening one SharedStore per user under ``data_dir``"""
+    stores = {}
+    lock = threading.Lock()
+
+    def get_store(user):
+        with lock:
+            if user not in stores:
+                stores[user] = SharedStore(open_store(user_dir(data_dir, user), backend))
+            return stores[user]
+    return get_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accept workout, strength and meal records over HTTP")
+    parser.add_argument("address", nargs="?", default="127.0.0.1:8765",
+                        help='"[host:]port" or "unix:/path/to/socket" (default: 127.0.0.1:8765)')
+    parser.add_argument("--data-dir", default="workout_data")
+    args = parser.parse_args()
+
+    server = start(parse_address(args.address), store_opener(args.data_dir))
+    print(f"Accepting records on {args.address}; press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import http.client
+import json
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ingest
+from storage import open_store, user_dir
+
+
+def _session(job):
+    """Save records one at a time, like a user pressing "Log Meal" repeatedly"""
+    data_dir, backend, records, start_at = job
+    store = open_store(data_dir, backend)
+    time.sleep(max(0, start_at - time.time()))
+    start = time.time()
+    for i in range(records):
+        store.append("calories", {
+            "date": "2026-01-01", "meal_type": "Lunch", "food": f"Meal {i}",
+            "intake": 500, "protein": 30.0, "carbs": 50.0, "fats": 15.0, "notes": "",
+        })
+    return start, time.time()
+
+
+def run(root, backend, sessions, records, shared):
+    """Run concurrent writer processes and return their combined throughput.
+
+    With ``shared`` every session writes to the same user; otherwise each
+    session has its own shard.
+    """
+    users = ["default" if shared else f"load-{i}" for i in range(sessions)]
+    for user in set(users):
+        open_store(user_dir(root, user), backend)
+    # Workers start writing together once every process is up
+    start_at = time.time() + 1 + 0.25 * sessions
+    jobs = [(str(user_dir(root, user)), backend, records, start_at) for user in users]
+    # Forked workers would inherit this process's open database handles
+    with ProcessPoolExecutor(sessions, mp_context=multiprocessing.get_context("spawn")) as pool:
+        spans = list(pool.map(_session, jobs))
+    seconds = max(end for _, end in spans) - min(start for start, _ in spans)
+    saved = sum(len(open_store(user_dir(root, user), backend).load("calories")) for user in set(users))
+    return {
+        "backend": backend,
+        "sessions": sessions,
+        "shared_user": shared,
+        "records": sessions * records,
+        "saved": saved,
+        "seconds": round(seconds, 3),
+        "records_per_second": round(sessions * records / seconds, 1),
+    }
+
+
+def _device(job):
+    """Post batches of meals to the ingest service, retrying when it asks to back off"""
+    port, user, uploads, batch, start_at = job
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    time.sleep(max(0, start_at - time.time()))
+    start, retries = time.time(), 0
+    for i in range(uploads):
+        body = json.dumps({"user": user, "calories": [{
+            "date": "2026-01-01", "meal_type": "Snack", "food": f"Reading {i}.{j}",
+            "intake": 100, "protein": 5.0, "carbs": 10.0, "fats": 3.0,
+        } for j in range(batch)]}).encode()
+        while True:
+            connection.request("POST", "/v1/records", body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 503:
+                break
+            retries += 1
+            time.sleep(0.05)
+        if response.status != 200:
+            raise RuntimeError(f"Upload failed with {response.status}")
+    return start, time.time(), retries
+
+
+def run_ingest(root, backend, devices, uploads, batch, users):
+    """Post batches from concurrent device processes to an ingest server and measure throughput.
+
+    The server runs in this process; devices are spread over ``users``
+    profiles. Every upload is acknowledged only once saved.
+    """
+    server = ingest.start(("127.0.0.1", 0), ingest.store_opener(root, backend))
+    try:
+        port = server.server_address[1]
+        start_at = time.time() + 1 + 0.25 * devices
+        jobs = [(port, f"load-{i % users}", uploads, batch, start_at) for i in range(devices)]
+        with ProcessPoolExecutor(devices, mp_context=multiprocessing.get_context("spawn")) as pool:
+            spans = list(pool.map(_device, jobs))
+    finally:
+        server.close()
+    seconds = max(end for _, end, _ in spans) - min(start for start, _, _ in spans)
+    stats = server.committer.stats
+    saved = sum(len(open_store(user_dir(root, f"load-{i}"), backend).load("calories")) for i in range(users))
+    return {
+        "backend": backend,
+        "devices": devices,
+        "users": users,
+        "batch": batch,
+        "records": devices * uploads * batch,
+        "saved": saved,
+        "seconds": round(seconds, 3),
+        "records_per_second": round(devices * uploads * batch / seconds, 1),
+        "commits": stats["commits"],
+        "records_per_commit": round(stats["records"] / max(stats["commits"], 1), 1),
+        "retries": sum(retries for _, _, retries in spans),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure write throughput with concurrent sessions")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="sqlite")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--records", type=int, default=500, help="records saved per session")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--ingest", action="store_true",
+                        help="post batches to the ingest service instead of saving directly")
+    parser.add_argument("--batch", type=int, default=50, help="records per upload with --ingest")
+    parser.add_argument("--users", type=int, default=4,
+                        help="profiles the devices upload to with --ingest")
+    args = parser.parse_args()
+
+    results = []
+    if args.ingest:
+        for devices in args.sessions:
+            with tempfile.TemporaryDirectory() as root:
+                result = run_ingest(root, args.backend, devices, args.records // args.batch or 1,
+                                    args.batch, args.users)
+            results.append(result)
+            lost = result["records"] - result["saved"]
+            print(f"{args.backend:6} ingest {devices:3} devices: {result['records_per_second']:9.1f} records/s"
+                  f"  {result['records_per_commit']:7.1f} records/commit  {result['retries']} retries"
+                  + (f"  ({lost} records lost!)" if lost else ""))
+    for shared in () if args.ingest else (False, True):
+        for sessions in args.sessions:
+            with tempfile.TemporaryDirectory() as root:
+                result = run(root, args.backend, sessions, args.records, shared)
+            results.append(result)
+            mode = "same user" if shared else "own shard"
+            lost = result["records"] - result["saved"]
+            print(f"{args.backend:6} {mode:9} {sessions:3} sessions: "
+                  f"{result['records_per_second']:9.1f} records/s"
+                  + (f"  ({lost} records lost!)" if lost else ""))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
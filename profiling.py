@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+
+import analytics
+
+# Phases a page render is split into, in display order
+PHASES = ["load", "filter", "aggregate", "chart", "serialize"]
+
+# Samples kept per page and phase for the rolling percentiles
+WINDOW = 200
+
+_samples = {}
+_lock = threading.Lock()
+_NULL = nullcontext()
+
+
+class _Phase:
+    def __init__(self, render, name):
+        self.render = render
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.render.phases[self.name] = self.render.phases.get(self.name, 0.0) + elapsed
+
+
+class RenderProfile:
+    """Phase timings and records scanned for one script run of one page"""
+
+    enabled = True
+
+    def __init__(self, log_path=None):
+        self.page = None
+        self.log_path = log_path
+        self.phases = {}
+        self.records = 0
+        self.start = time.perf_counter()
+
+    def phase(self, name):
+        """Context manager adding the time spent inside it to a phase"""
+        return _Phase(self, name)
+
+    def call(self, name, function, *args, **kwargs):
+        """Call ``function``, adding its run time to a phase and the table rows it aggregated"""
+        rows = analytics.rows_scanned()
+        try:
+            with self.phase(name):
+                return function(*args, **kwargs)
+        finally:
+            self.records += analytics.rows_scanned() - rows
+
+    def scanned(self, count):
+        """Count records read by this render outside ``call`` aggregations"""
+        self.records += count
+
+    def finish(self):
+        """Add this render to the rolling samples and the metrics log"""
+        total = (time.perf_counter() - self.start) * 1000
+        sample = {**self.phases, "total": total, "records": self.records}
+        with _lock:
+            for phase, value in sample.items():
+                _samples.setdefault((self.page, phase), deque(maxlen=WINDOW)).append(value)
+        if self.log_path is not None:
+            line = {"time": datetime.now().isoformat(timespec="milliseconds"), "page": self.page,
+                    **{phase: round(value, 3) for phase, value in sample.items()}}
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+class _Disabled:
+    """Stand-in used while profiling is off; every method is a no-op"""
+
+    enabled = False
+    page = None
+
+    def phase(self, name):
+        return _NULL
+
+    def call(self, name, function, *args, **kwargs):
+        return function(*args, **kwargs)
+
+    def scanned(self, count):
+        pass
+
+    def finish(self):
+        pass
+
+
+DISABLED = _Disabled()
+
+
+def start(enabled, log_path=None):
+    """Return a profile for the current render, or the shared no-op one"""
+    return RenderProfile(log_path) if enabled else DISABLED
+
+
+def summary():
+    """Return rolling p50/p95 per page and phase (ms; "records" is a count)"""
+    with _lock:
+        samples = {key: list(values) for key, values in _samples.items()}
+    rows = []
+    order = PHASES + ["total", "records"]
+
+    def key(item):
+        page, phase = item[0]
+        return page or "", order.index(phase) if phase in order else len(order), phase
+    for (page, phase), values in sorted(samples.items(), key=key):
+        p50, p95 = np.percentile(values, [50, 95])
+        rows.append({"page": page, "phase": phase, "samples": len(values),
+                     "p50": round(float(p50), 2), "p95": round(float(p95), 2)})
+    return rows
+
+
+def reset():
+    """Drop every collected sample"""
+    with _lock:
+        _samples.clear()
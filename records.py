@@ -0,0 +1,129 @@
+from bisect import bisect_left
+
+# Kinds of personal record, in the order badges are shown
+RECORD_KINDS = {
+    "weight": "Heaviest weight",
+    "reps": "Most reps at this weight",
+    "1rm": "Best estimated 1RM",
+    "volume": "Best session volume",
+}
+
+
+def estimated_1rm(weight, reps):
+    """Epley estimate of the one-rep max for a set"""
+    return weight * (1 + reps / 30) if reps > 1 else weight
+
+
+def session_volume(entry):
+    """Total load moved in one entry (weight x reps x sets)"""
+    return entry["weight"] * entry["reps"] * entry["sets"]
+
+
+def _summary(entry, value):
+    return {"value": value, "date": str(entry["date"])[:10], "weight": entry["weight"],
+            "reps": entry["reps"], "sets": entry["sets"]}
+
+
+def new_records(current, entry):
+    """Return the record kinds ``entry`` would set for an exercise.
+
+    ``current`` is the exercise's record dict (or None for an exercise
+    never logged before, in which case nothing counts as a new record).
+    """
+    if current is None:
+        return []
+    kinds = []
+    if entry["weight"] > current["weight"]["value"]:
+        kinds.append("weight")
+    weights = current["weights"]
+    i = bisect_left(weights, entry["weight"])
+    if i < len(weights) and weights[i] == entry["weight"] and entry["reps"] > current["reps"][i]:
+        kinds.append("reps")
+    if estimated_1rm(entry["weight"], entry["reps"]) > current["1rm"]["value"]:
+        kinds.append("1rm")
+    if session_volume(entry) > current["volume"]["value"]:
+        kinds.append("volume")
+    return kinds
+
+
+def clean_entry(entry):
+    """Return a strength entry with missing weight, reps and sets as 0"""
+    return {**entry, "weight": entry.get("weight", 0) or 0,
+            "reps": entry.get("reps", 0) or 0, "sets": entry.get("sets", 0) or 0}
+
+
+def update_bests(current, entry):
+    """Fold a cleaned entry into an exercise's best weight, 1RM and session volume.
+
+    ``current`` holds those bests and the ``entries`` count, or is None for
+    an exercise never logged; returns it updated.
+    """
+    if current is None:
+        return {
+            "weight": _summary(entry, entry["weight"]),
+            "1rm": _summary(entry, estimated_1rm(entry["weight"], entry["reps"])),
+            "volume": _summary(entry, session_volume(entry)),
+            "entries": 1,
+        }
+    if entry["weight"] > current["weight"]["value"]:
+        current["weight"] = _summary(entry, entry["weight"])
+    if estimated_1rm(entry["weight"], entry["reps"]) > current["1rm"]["value"]:
+        current["1rm"] = _summary(entry, estimated_1rm(entry["weight"], entry["reps"]))
+    if session_volume(entry) > current["volume"]["value"]:
+        current["volume"] = _summary(entry, session_volume(entry))
+    current["entries"] += 1
+    return current
+
+
+class PersonalRecords:
+    """Per-exercise personal records, updated one strength entry at a time.
+
+    For each exercise it keeps the best weight, estimated 1RM and session
+    volume, the best reps at every weight lifted (``weights``/``reps``
+    sorted by weight) and a ``progress`` list of [date, top weight] per
+    training day sorted by date. Lookups are bisections, so adding an entry
+    costs O(log n) comparisons. Serializes straight to JSON.
+    """
+
+    def __init__(self, name="strength_logs", data=None):
+        self.name = name
+        self.exercises = data if data is not None else {}
+
+    def add(self, entry):
+        """Fold one entry into its exercise's records"""
+        entry = clean_entry(entry)
+        current = self.exercises.get(entry.get("exercise"))
+        if current is None:
+            self.exercises[entry.get("exercise")] = {
+                **update_bests(None, entry),
+                "weights": [entry["weight"]],
+                "reps": [entry["reps"]],
+                "progress": [[str(entry["date"])[:10], entry["weight"]]],
+            }
+            return
+        update_bests(current, entry)
+        weights = current["weights"]
+        i = bisect_left(weights, entry["weight"])
+        if i < len(weights) and weights[i] == entry["weight"]:
+            current["reps"][i] = max(current["reps"][i], entry["reps"])
+        else:
+            weights.insert(i, entry["weight"])
+            current["reps"].insert(i, entry["reps"])
+        progress = current["progress"]
+        day = str(entry["date"])[:10]
+        i = bisect_left(progress, [day])
+        if i < len(progress) and progress[i][0] == day:
+            progress[i][1] = max(progress[i][1], entry["weight"])
+        else:
+            progress.insert(i, [day, entry["weight"]])
+
+    def extend(self, entries):
+        for entry in entries:
+            self.add(entry)
+
+    def get(self, exercise):
+        """Return the records of one exercise, or None if never logged"""
+        return self.exercises.get(exercise)
+
+    def to_json(self):
+        return self.exercises
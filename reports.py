@@ -0,0 +1,170 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+
+import core
+from core import _add
+from segments import SegmentDir
+from storage import SharedStore, existing_users, open_store, user_dir
+
+PERIODS = ["week", "month"]
+
+# Users with the most minutes listed in the group rollup
+TOP_USERS = 10
+
+
+def period_range(period, day):
+    """Return ``(label, start, end)`` of the week (Monday first) or month containing ``day``"""
+    if period == "week":
+        start = day - timedelta(days=day.weekday())
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}", start, start + timedelta(days=6)
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start.strftime("%Y-%m"), start, end
+
+
+def user_report(store, user, period, day):
+    """Return one user's report for the period containing ``day``.
+
+    Day totals come from the daily rollup and the muscle and exercise
+    breakdowns from the period's records only; the weekly report and the
+    monthly volume are the Progress page's (``core``).
+    """
+    label, start, end = period_range(period, day)
+    days = store.daily_summary(start, end).values()
+    categories, muscles, volume = {}, {}, {}
+    for stats in days:
+        _add(categories, stats.get("categories", {}))
+    for workout in store.query("workouts", start, end):
+        _add(muscles, workout.get("muscles") or {})
+    for entry in store.query("strength_logs", start, end):
+        load = (entry.get("weight") or 0) * (entry.get("reps") or 0) * (entry.get("sets") or 0)
+        _add(volume, {entry.get("exercise"): load})
+    sessions = sum(stats["sessions"] for stats in days)
+    minutes = sum(stats["minutes"] for stats in days)
+    logged = [stats for stats in days if stats["meals"]]
+    monthly = core.monthly_volume(store)
+    return {
+        "user": user,
+        "period": label,
+        "start": str(start),
+        "end": str(end),
+        "workouts": sessions,
+        "minutes": minutes,
+        "avg_duration": minutes / sessions if sessions else 0,
+        "categories": categories,
+        "muscles": muscles,
+        "strength_volume": volume,
+        "calories": {
+            "days_logged": len(logged),
+            "intake": sum(stats["intake"] for stats in logged),
+            "avg_intake": sum(stats["intake"] for stats in logged) / len(logged) if logged else 0,
+            **{field: sum(stats[field] for stats in logged) for field in ("protein", "carbs", "fats")},
+        },
+        "weekly_report": core.weekly_report(store, end).to_dict("records"),
+        "monthly_volume": monthly.tail(12).to_dict("records"),
+    }
+
+
+def _report_job(job):
+    """Write one user's report file and return its totals for the group rollup.
+
+    Runs in a worker process: it opens the user's store itself, so only
+    the paths and the report totals cross the process boundary.
+    """
+    data_dir, user, period, day, out_dir = job
+    shard = user_dir(data_dir, user)
+    store = SharedStore(open_store(shard), segments=SegmentDir(shard / "segments"))
+    report = user_report(store, user, period, day)
+    path = Path(out_dir) / f"{user}.json"
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    return {field: report[field] for field in ("user", "workouts", "minutes", "categories", "muscles")} | {
+        "intake": report["calories"]["avg_intake"], "days_logged": report["calories"]["days_logged"]}
+
+
+def group_rollup(totals, label):
+    """Combine the per-user totals into one group report"""
+    active = [user for user in totals if user["workouts"]]
+    logging = [user for user in totals if user["days_logged"]]
+    categories, muscles = {}, {}
+    for user in totals:
+        _add(categories, user["categories"])
+        _add(muscles, user["muscles"])
+    return {
+        "period": label,
+        "users": len(totals),
+        "active_users": len(active),
+        "workouts": sum(user["workouts"] for user in totals),
+        "minutes": sum(user["minutes"] for user in totals),
+        "avg_minutes_per_active_user": sum(user["minutes"] for user in active) / len(active) if active else 0,
+        "categories": categories,
+        "muscles": muscles,
+        "avg_daily_intake": sum(user["intake"] for user in logging) / len(logging) if logging else 0,
+        "top_users": [{"user": user["user"], "minutes": user["minutes"]}
+                      for user in sorted(totals, key=lambda user: -user["minutes"])[:TOP_USERS]],
+    }
+
+
+def _context():
+    # The parent opens no stores, so forked workers inherit the imported
+    # modules copy-on-write instead of importing pandas again each
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def run(data_dir, period, day, out, users=None, workers=None, progress=None):
+    """Write a report per user plus ``group.json`` under ``out/<period label>/``.
+
+    Users are spread over a pool of ``workers`` processes (default: one per
+    core). ``progress`` is called with each finished user's totals.
+    Returns the group rollup. Raises ValueError for a profile that does not
+    exist, since opening its store would create it.
+    """
+    users = existing_users(data_dir, users)
+    label = period_range(period, day)[0]
+    out_dir = Path(out) / label
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(str(data_dir), user, period, day, str(out_dir)) for user in users]
+    totals = []
+    with ProcessPoolExecutor(workers or os.cpu_count(), mp_context=_context()) as pool:
+        for future in as_completed([pool.submit(_report_job, job) for job in jobs]):
+            totals.append(future.result())
+            if progress is not None:
+                progress(totals[-1])
+    totals.sort(key=lambda user: users.index(user["user"]))
+    group = group_rollup(totals, label)
+    with open(out_dir / "group.json", "w") as f:
+        json.dump(group, f, indent=2)
+    return group
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write weekly or monthly reports for every profile")
+    parser.add_argument("period", choices=PERIODS)
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(),
+                        help="any day in the period to report on (default: today)")
+    parser.add_argument("--data-dir", default="workout_data")
+    parser.add_argument("--out", default="reports", help="directory the reports are written to")
+    parser.add_argument("--users", nargs="+", help="profiles to report on (default: all)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        group = run(args.data_dir, args.period, args.date, args.out, args.users, args.workers)
+    except ValueError as exc:
+        parser.error(str(exc))
+    seconds = time.perf_counter() - start
+    print(f"{group['users']} reports for {group['period']} written to {Path(args.out) / group['period']} "
+          f"in {seconds:.1f}s ({group['users'] / seconds:.1f} users/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+
+# Per-day totals kept for each rolled-up collection
+ROLLUP_FIELDS = {
+    "workouts": ["minutes", "sessions"],
+    "calories": ["intake", "protein", "carbs", "fats", "meals"],
+}
+
+
+def _to_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def empty_day():
+    """Return a day with every rolled-up total at zero"""
+    day = {field: 0 for fields in ROLLUP_FIELDS.values() for field in fields}
+    day["categories"] = {}
+    return day
+
+
+def record_increments(name, record):
+    """Return the amounts one record adds to its day's totals"""
+    if name == "workouts":
+        return {"minutes": record.get("minutes", 0), "sessions": 1}
+    return {
+        "intake": record.get("intake", 0),
+        "protein": record.get("protein", 0),
+        "carbs": record.get("carbs", 0),
+        "fats": record.get("fats", 0),
+        "meals": 1,
+    }
+
+
+class DailyRollup:
+    """Per-day totals for one collection, updated one record at a time.
+
+    Workout days also carry minutes per workout category. Days are keyed by
+    'YYYY-MM-DD' strings so the rollup serializes straight to JSON.
+    """
+
+    def __init__(self, name, data=None):
+        self.name = name
+        self.days = data if data is not None else {}
+
+    def add(self, record):
+        """Fold one record into its day in O(1)"""
+        key = str(record["date"])[:10]
+        day = self.days.get(key)
+        if day is None:
+            day = self.days[key] = {field: 0 for field in ROLLUP_FIELDS[self.name]}
+            if self.name == "workouts":
+                day["categories"] = {}
+        for field, amount in record_increments(self.name, record).items():
+            day[field] += amount
+        if self.name == "workouts":
+            category = record.get("category", "Other")
+            day["categories"][category] = day["categories"].get(category, 0) + record.get("minutes", 0)
+
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+
+    def to_json(self):
+        return self.days
+
+
+def summarize(start, end, *rollups):
+    """Merge rollups into one entry per day from ``start`` to ``end``.
+
+    Cost depends on the number of days in the range, not on how many
+    records were ever logged.
+    """
+    start, end = _to_date(start), _to_date(end)
+    summary = {}
+    current = start
+    while current <= end:
+        key = str(current)
+        day = empty_day()
+        for rollup in rollups:
+            stored = rollup.days.get(key)
+            if stored:
+                day.update(stored)
+                day["categories"] = dict(day["categories"])
+        summary[key] = day
+        current += timedelta(days=1)
+    return summary
+
+
+# Trailing windows, in days, tracked by RollingWindows
+WINDOWS = (7, 30, 90)
+
+
+class RollingWindows:
+    """Running totals of one collection over the trailing WINDOWS days.
+
+    The window ends at ``today`` and is seeded from a ``summarize`` result
+    covering the longest window. Each added record updates every window's
+    sums in O(1), so reading a trend never depends on history length.
+    Records dated after ``today`` or before the longest window are ignored.
+    """
+
+    def __init__(self, name, today, days=None):
+        self.name = name
+        self.today = _to_date(today)
+        self.fields = ROLLUP_FIELDS[name]
+        self.sums = {window: dict.fromkeys(self.fields, 0) for window in WINDOWS}
+        for key, day in (days or {}).items():
+            self._add(_to_date(key), day)
+
+    def _add(self, day, amounts):
+        age = (self.today - day).days
+        for window, sums in self.sums.items():
+            if 0 <= age < window:
+                for field in self.fields:
+                    sums[field] += amounts.get(field) or 0
+
+    def add(self, record):
+        """Fold one record into every window it falls in"""
+        self._add(_to_date(record["date"]), record_increments(self.name, record))
+
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+
+    def totals(self, window):
+        """Return each field's sum over the last ``window`` days"""
+        return dict(self.sums[window])
+
+    def means(self, window):
+        """Return each field's average per calendar day over the last ``window`` days"""
+        return {field: total / window for field, total in self.sums[window].items()}
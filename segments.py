@@ -0,0 +1,164 @@
+import json
+import os
+import uuid
+from datetime import date
+from itertools import permutations
+from pathlib import Path
+
+import numpy as np
+
+import analytics
+from columnar import EPOCH_ORDINAL, ColumnTable
+from storage import file_lock, write_json_atomic
+
+# Bump when the segment or manifest layout changes; older segments are then rebuilt
+FORMAT_VERSION = 1
+
+
+def summarize(table):
+    """Return the totals precomputed for a segment's rows.
+
+    Every segment has its row count, first and last date ordinal and the
+    distinct values of each category field (also per value of every other
+    category field, for filtered pickers). Workouts add minutes per
+    category, muscle group and cardio type; strength logs add volume
+    (weight x reps x sets) per exercise; calories add intake and macro
+    totals and the ``analytics.food_usage`` of the month.
+    """
+    n = table.length
+    dates = table.columns["date"][:n]
+    summary = {"rows": n, "first": int(dates.min()), "last": int(dates.max())}
+    summary["distinct"] = {field: table.distinct(field) for field in table.dictionaries}
+    summary["groups"] = {}
+    for field, by in permutations(table.dictionaries, 2):
+        summary["groups"][f"{field}/{by}"] = {value: table.distinct(field, **{by: value})
+                                              for value in table.dictionaries[by]}
+    if table.name == "workouts":
+        summary["minutes"] = float(table.columns["minutes"][:n].sum())
+        summary["categories"] = analytics.category_totals(table)
+        for parent in table.nested:
+            summary[parent] = analytics.nested_totals(table, parent)
+    elif table.name == "strength_logs":
+        volume = (table.columns["weight"][:n] * table.columns["reps"][:n].astype(np.float64)
+                  * table.columns["sets"][:n])
+        codes = table.columns["exercise"][:n].astype(np.int64)
+        totals = np.bincount(codes[codes >= 0], weights=volume[codes >= 0],
+                             minlength=len(table.dictionaries["exercise"]))
+        summary["volume"] = dict(zip(table.dictionaries["exercise"], totals.tolist()))
+    elif table.name == "calories":
+        for field in ("intake", "protein", "carbs", "fats"):
+            summary[field] = float(np.nansum(table.columns[field][:n]))
+        summary["foods"] = analytics.food_usage(table)
+    return summary
+
+
+class SegmentDir:
+    """Immutable, compressed monthly segments of closed months.
+
+    Each collection has a manifest (``<name>.json``) listing its segment
+    files, each holding the records of one month in columnar form plus
+    their ``summarize`` totals, and marking which storage records they
+    cover: every record up to position ``watermark`` that is dated before
+    ``hot_start``. Everything else is the hot part, loaded from storage.
+    Sealing a month writes new segments for the hot records dated before
+    the new ``hot_start``; a record backdated into a sealed month later
+    lands in one more segment for that month at the next seal.
+
+    Segments are derived from storage like the column snapshots: deleting
+    the directory only means they are written again.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def lock(self, name):
+        """Hold the collection's segment lock across threads and processes"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        return file_lock(self.path / f"{name}.lock")
+
+    def manifest(self, name):
+        """Return a collection's manifest, or an empty one"""
+        try:
+            with open(self.path / f"{name}.json", "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+        if manifest is None or manifest.get("format") != FORMAT_VERSION:
+            return {"format": FORMAT_VERSION, "watermark": 0, "hot_start": None, "segments": []}
+        return manifest
+
+    def _write(self, name, part, month):
+        path = self.path / f"{name}-{month}-{uuid.uuid4().hex[:12]}.npz"
+        arrays, objects = {}, {}
+        for field, column in part.columns.items():
+            values = column[:part.length]
+            if values.dtype == object:
+                objects[field] = values.tolist()
+            else:
+                arrays[field] = values
+        meta = {"name": name, "length": part.length, "dictionaries": part.dictionaries, "objects": objects}
+        arrays["meta"] = np.frombuffer(json.dumps(meta, default=str).encode(), dtype=np.uint8)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return path.name
+
+    def seal(self, name, hot, last, hot_start):
+        """Move the hot rows dated before ``hot_start`` into monthly segments.
+
+        ``hot`` holds the hot records as loaded with the manifest's
+        watermark and ``last`` is the storage position of the newest one.
+        Writes the new manifest and returns it with the rows left hot.
+        Call with ``lock(name)`` held.
+        """
+        manifest = self.manifest(name)
+        dates = hot.columns["date"][:hot.length]
+        old = np.flatnonzero(dates < date.fromisoformat(hot_start).toordinal())
+        months = (dates[old] - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+        for month in np.unique(months):
+            part = hot.take(old[months == month])
+            label = str(month)
+            manifest["segments"].append({"file": self._write(name, part, label), "month": label,
+                                         **summarize(part)})
+        # The manifest's rename also makes the new segment files durable
+        manifest.update(watermark=last, hot_start=hot_start)
+        write_json_atomic(self.path / f"{name}.json", manifest)
+        return manifest, hot.take(np.flatnonzero(dates >= date.fromisoformat(hot_start).toordinal()))
+
+    def read(self, name, segment):
+        """Load one segment as a ColumnTable"""
+        with np.load(self.path / segment["file"]) as data:
+            meta = json.loads(data["meta"].tobytes())
+            table = ColumnTable(name, capacity=max(1, meta["length"]))
+            for field, column in table.columns.items():
+                if field in meta["objects"]:
+                    # fromiter keeps list and dict values as single objects
+                    column[:meta["length"]] = np.fromiter(meta["objects"][field], dtype=object,
+                                                          count=meta["length"])
+                else:
+                    values = data[field]
+                    if values.dtype != column.dtype:
+                        # Category codes are stored int32 once they outgrew int16
+                        table.columns[field] = column = column.astype(values.dtype)
+                    column[:meta["length"]] = values
+        table.length = meta["length"]
+        table.dictionaries = meta["dictionaries"]
+        table._codes = {field: {value: code for code, value in enumerate(values)}
+                        for field, values in table.dictionaries.items()}
+        return table
+
+    def clear(self, name):
+        """Drop a collection's segments: the manifest first, then one file per segment"""
+        manifest = self.manifest(name)
+        try:
+            os.remove(self.path / f"{name}.json")
+        except FileNotFoundError:
+            pass
+        for segment in manifest["segments"]:
+            try:
+                os.remove(self.path / segment["file"])
+            except FileNotFoundError:
+                pass
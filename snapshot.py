@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from columnar import NESTED, SCHEMAS, ColumnTable
+from storage import write_json_atomic
+
+# Bump when the on-disk layout changes; older snapshots are then rebuilt
+FORMAT_VERSION = 1
+
+
+class ObjectColumn:
+    """Read-only column of JSON values stored as one blob plus row offsets.
+
+    Both arrays are memory-mapped and values are only decoded for the rows
+    that are actually indexed.
+    """
+
+    dtype = np.dtype(object)
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, rows):
+        if isinstance(rows, slice):
+            rows = range(*rows.indices(len(self)))
+        out = np.empty(len(rows), dtype=object)
+        for i, row in enumerate(rows):
+            out[i] = json.loads(self.blob[self.offsets[row]:self.offsets[row + 1]].tobytes())
+        return out
+
+
+def _save(path, array):
+    with open(path, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _write_object_column(values, directory, field):
+    encoded = [json.dumps(value, default=str).encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    _save(directory / f"{field}.offsets.npy", offsets)
+    _save(directory / f"{field}.blob.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+
+def _read_object_column(directory, field):
+    return ObjectColumn(np.load(directory / f"{field}.offsets.npy", mmap_mode="r"),
+                        np.load(directory / f"{field}.blob.npy", mmap_mode="r"))
+
+
+def _layout(name):
+    return {"schema": SCHEMAS[name], "nested": NESTED.get(name, {})}
+
+
+class SnapshotDir:
+    """Directory of versioned, memory-mappable column snapshots.
+
+    Each collection has a meta file (``<name>.json``) pointing at a
+    directory with one ``.npy`` file per fixed-width column and an
+    offsets/blob pair per object column. Opening a snapshot only maps the
+    files, so startup cost does not grow with the number of records.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def read_meta(self, name):
+        try:
+            with open(self.path / f"{name}.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def read(self, name, revision):
+        """Open a snapshot as a memory-mapped ColumnTable.
+
+        Returns None when there is no snapshot, it was written by another
+        format version or schema, or it does not match ``revision``; the
+        caller then falls back to loading the records from storage.
+        """
+        meta = self.read_meta(name)
+        if (meta is None or meta.get("format") != FORMAT_VERSION
+                or meta.get("layout") != _layout(name) or meta.get("revision") != revision):
+            return None
+        directory = self.path / meta["directory"]
+        table = ColumnTable(name, capacity=0)
+        try:
+            for field, column in table.columns.items():
+                if column.dtype == object:
+                    table.columns[field] = _read_object_column(directory, field)
+                else:
+                    table.columns[field] = np.load(directory / f"{field}.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        table.length = meta["length"]
+        table.dictionaries = meta["dictionaries"]
+        table._codes = {field: {value: code for code, value in enumerate(values)}
+                        for field, values in table.dictionaries.items()}
+        return table
+
+    def write(self, table, length, dictionaries, revision):
+        """Write the first ``length`` rows of a table as a snapshot.
+
+        Columns go to a fresh directory; the snapshot only becomes visible
+        when its meta file is atomically replaced, after which the previous
+        directory is removed.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        directory = self.path / f"{table.name}-{uuid.uuid4().hex}"
+        directory.mkdir()
+        for field, column in table.columns.items():
+            values = column[:length]
+            if values.dtype == object:
+                _write_object_column(values, directory, field)
+            else:
+                _save(directory / f"{field}.npy", np.ascontiguousarray(values))
+        old = self.read_meta(table.name)
+        write_json_atomic(self.path / f"{table.name}.json", {
+            "format": FORMAT_VERSION,
+            "layout": _layout(table.name),
+            "directory": directory.name,
+            "length": length,
+            "dictionaries": dictionaries,
+            "revision": revision,
+        })
+        if old and old.get("directory"):
+            shutil.rmtree(self.path / old["directory"], ignore_errors=True)
@@ -0,0 +1,1314 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+import numpy as np
+
+from columnar import ColumnTable, to_ordinal
+from records import PersonalRecords, clean_entry, update_bests
+from rollups import ROLLUP_FIELDS, WINDOWS, DailyRollup, RollingWindows, record_increments, summarize
+
+# Collections that are logged one record at a time
+COLLECTIONS = ["workouts", "strength_logs", "calories"]
+
+# Journal length at which a background compaction is started
+COMPACT_THRESHOLD = 500
+
+# Derived indexes the JSON store keeps up to date with each collection
+INDEXES = {
+    "workouts": DailyRollup,
+    "strength_logs": PersonalRecords,
+    "calories": DailyRollup,
+}
+
+# Shared encoder for records; json.dumps(..., default=str) builds a new one per call
+_encoder = json.JSONEncoder(default=str)
+
+# Seconds to wait after a write before refreshing the binary snapshots
+SNAPSHOT_DELAY = 2.0
+
+# Profile whose data lives directly in the data directory; every other
+# profile gets its own shard under users/<id>/
+DEFAULT_USER = "default"
+
+# Record fields that can be filtered on, per collection
+INDEXED_FIELDS = {
+    "workouts": ["category"],
+    "strength_logs": ["exercise", "muscle_group"],
+    "calories": ["meal_type"],
+}
+
+
+def day_key(value):
+    """Normalize a date, datetime or ISO string to a 'YYYY-MM-DD' key"""
+    return str(value)[:10]
+
+
+def _matches(record, start, end, equals):
+    day = day_key(record["date"])
+    if start is not None and day < day_key(start):
+        return False
+    if end is not None and day > day_key(end):
+        return False
+    return all(record.get(field) == value for field, value in equals.items())
+
+
+def _exercise_key(entry):
+    # Primary keys treat NULLs as distinct, so a missing exercise is stored as ""
+    exercise = entry.get("exercise")
+    return "" if exercise is None else exercise
+
+
+class ConflictError(Exception):
+    """Raised when a write expected a revision that another writer replaced"""
+
+
+def user_id(name):
+    """Normalize a profile name into a directory-safe user id"""
+    return re.sub(r"[^a-z0-9_-]+", "-", name.strip().lower()).strip("-") or DEFAULT_USER
+
+
+def user_dir(data_dir, user):
+    """Return the directory holding one user's data shard"""
+    data_dir = Path(data_dir)
+    return data_dir if user == DEFAULT_USER else data_dir / "users" / user
+
+
+def list_users(data_dir):
+    """Return the ids of every user with a data shard, default user first"""
+    users_dir = Path(data_dir) / "users"
+    users = sorted(p.name for p in users_dir.iterdir() if p.is_dir()) if users_dir.exists() else []
+    return [DEFAULT_USER] + users
+
+
+def existing_users(data_dir, names=None):
+    """Return the ids of the named profiles, or of every profile by default.
+
+    Names are normalized with ``user_id`` and deduplicated. Raises
+    ValueError if the data directory or a profile does not exist, since
+    opening its store would create it.
+    """
+    if not Path(data_dir).is_dir():
+        raise ValueError(f"No data directory at {data_dir}")
+    known = list_users(data_dir)
+    if not names:
+        return known
+    users = list(dict.fromkeys(user_id(name) for name in names))
+    unknown = [user for user in users if user not in known]
+    if unknown:
+        raise ValueError(f"Unknown profiles: {', '.join(unknown)}")
+    return users
+
+
+@contextmanager
+def file_lock(path, blocking=True):
+    """Hold an exclusive advisory lock on ``path`` across threads and processes.
+
+    Yields whether the lock was taken, which is only False when a
+    non-blocking attempt finds it held elsewhere.
+    """
+    with open(path, "a") as f:
+        if fcntl is not None:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _file_stats(paths):
+    """Return the inode, mtime and size of each path, None for missing ones"""
+    stats = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stats.append(None)
+        else:
+            stats.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+def _fsync_dir(path):
+    """Flush a directory entry so renames inside it survive a crash"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file, fsync it and rename it over the target"""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+class JournalStore:
+    """Snapshot + append-only journal storage for the tracker collections.
+
+    Every collection has a snapshot (``<name>.snapshot.json``) holding the
+    compacted records and the sequence number they cover, plus a journal
+    (``<name>.jsonl``) with one ``{"seq": n, "record": {...}}`` line per
+    append. Loading replays the snapshot and then every journal line with a
+    higher sequence number, so a crash at any point of a compaction never
+    loses or duplicates records.
+
+    Writes hold an advisory lock on ``<name>.lock``, so several processes
+    can share a data directory; each re-reads the journal position when
+    another one has written since.
+    """
+
+    indexed = False
+
+    def __init__(self, data_dir, compact_threshold=COMPACT_THRESHOLD):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_threshold = compact_threshold
+        self._locks = {name: threading.Lock() for name in COLLECTIONS}
+        self._seq = {}
+        self._seq_stats = {}
+        self._journal_len = {}
+        self._compacting = set()
+        self._indexes = {}
+        self._versions = {}
+
+    def _snapshot_path(self, name):
+        return self.data_dir / f"{name}.snapshot.json"
+
+    def _legacy_path(self, name):
+        return self.data_dir / f"{name}.json"
+
+    def _journal_path(self, name):
+        return self.data_dir / f"{name}.jsonl"
+
+    def _index_path(self, name):
+        return self.data_dir / f"{name}.index.json"
+
+    def _file_lock(self, name):
+        return file_lock(self.data_dir / f"{name}.lock")
+
+    def _snapshot_id(self, name):
+        """Identify the current snapshot file; it changes on compaction and clear"""
+        try:
+            stat = self._snapshot_path(name).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_consistent(self, name, read):
+        """Call ``read()`` until no snapshot swap raced it.
+
+        Another process may compact (replace the snapshot, then trim the
+        journal) between our reads of the two files; seeing the same
+        snapshot before and after proves they matched.
+        """
+        while True:
+            snapshot_id = self._snapshot_id(name)
+            result = read()
+            if self._snapshot_id(name) == snapshot_id:
+                return result
+
+    def _check_revision(self, name, expected):
+        if expected is not None and self.revision(name) != expected:
+            raise ConflictError(f"{name} was changed by another writer")
+
+    def _read_snapshot(self, name):
+        """Return (seq, records) from the snapshot or the legacy JSON file"""
+        path = self._snapshot_path(name)
+        if path.exists():
+            with open(path, "r") as f:
+                snapshot = json.load(f)
+            return snapshot["seq"], snapshot["records"]
+        legacy = self._legacy_path(name)
+        if legacy.exists():
+            with open(legacy, "r") as f:
+                return 0, json.load(f)
+        return 0, []
+
+    def _read_journal(self, name, after_seq, repair=False):
+        """Return journal entries newer than ``after_seq``.
+
+        Reading stops at a torn final line, which is either an append still
+        in flight or one cut short by a crash. With ``repair`` (only under
+        the file lock, where no append can be in flight) it is cut off so
+        later appends start on a clean line.
+        """
+        path = self._journal_path(name)
+        entries = []
+        if not path.exists():
+            return entries
+        good_offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                good_offset += len(line)
+                if entry["seq"] > after_seq:
+                    entries.append(entry)
+        if repair and good_offset != path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(good_offset)
+                os.fsync(f.fileno())
+        return entries
+
+    def load(self, name):
+        """Load a collection by replaying its snapshot and journal tail"""
+        def read():
+            seq, records = self._read_snapshot(name)
+            return records, self._read_journal(name, seq)
+        with self._locks[name]:
+            records, entries = self._read_consistent(name, read)
+            records.extend(entry["record"] for entry in entries)
+            self._journal_len[name] = len(entries)
+        return records
+
+    def load_recent(self, name, after=0, start=None):
+        """Return ``(records, last)``: records after position ``after`` plus those dated from ``start`` on.
+
+        Positions count records in load order from 1; ``last`` is the
+        position of the newest record, to pass as ``after`` next time.
+        The snapshot and journal have no date index, so this still parses
+        every record; only the in-memory hot table is smaller.
+        """
+        records = self.load(name)
+        recent = records[after:]
+        if start is not None:
+            start = day_key(start)
+            recent = [record for record in records[:after] if day_key(record["date"]) >= start] + recent
+        return recent, len(records)
+
+    def append(self, name, record):
+        """Durably append one record to a collection's journal"""
+        self.extend(name, [record])
+
+    def extend(self, name, records, expected=None):
+        """Durably append records to a collection's journal with one fsync.
+
+        With ``expected``, the write only happens if the collection is still
+        at that revision; otherwise ConflictError is raised. Returns the
+        collection's versions just before and after the write, both read
+        under the lock.
+        """
+        if not records:
+            version = self.version(name)
+            return version, version
+        with self._locks[name], self._file_lock(name):
+            self._check_revision(name, expected)
+            version = self.version(name)
+            if self._seq_stats.get(name) != self._stats(name):
+                # Another writer touched the files; resume after its last seq
+                self._seq[name] = self._last_seq(name)
+            index_is_current = name in self._indexes and self._indexes[name][0] == version
+            lines = []
+            for record in records:
+                self._seq[name] += 1
+                lines.append(_encoder.encode({"seq": self._seq[name], "record": record}) + "\n")
+            with open(self._journal_path(name), "a") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_len[name] = self._journal_len.get(name, 0) + len(lines)
+            self._seq_stats[name] = self._stats(name)
+            if index_is_current:
+                index = self._indexes[name][1]
+                index.extend(records)
+                self._indexes[name] = (self.version(name), index)
+            else:
+                self._indexes.pop(name, None)
+            needs_compaction = (self._journal_len[name] >= self.compact_threshold
+                                and name not in self._compacting)
+            if needs_compaction:
+                self._compacting.add(name)
+            versions = version, self.version(name)
+        if needs_compaction:
+            threading.Thread(target=self._compact_in_background, args=(name,),
+                             daemon=True).start()
+        return versions
+
+    def query(self, name, start=None, end=None, **equals):
+        """Return records in date order, filtered by date range and fields"""
+        records = [r for r in self.load(name) if _matches(r, start, end, equals)]
+        return sorted(records, key=lambda r: str(r["date"]))
+
+    def distinct(self, name, field):
+        """Return the sorted distinct values of a field"""
+        return sorted({r[field] for r in self.load(name) if field in r})
+
+    def clear(self, name, expected=None):
+        """Drop every record of a collection; returns the versions before and after"""
+        with self._locks[name], self._file_lock(name):
+            self._check_revision(name, expected)
+            version = self.version(name)
+            if self._seq_stats.get(name) != self._stats(name):
+                self._seq[name] = self._last_seq(name)
+            # Clearing takes a sequence number of its own, so the version moves
+            self._seq[name] += 1
+            write_json_atomic(self._snapshot_path(name),
+                              {"seq": self._seq[name], "records": []})
+            self._remove_legacy(name)
+            self._rewrite_journal(name, [])
+            write_json_atomic(self._index_path(name), {"seq": self._seq[name], "data": {}})
+            self._seq_stats[name] = self._stats(name)
+            self._indexes[name] = (self.version(name), INDEXES[name](name))
+            return version, self._indexes[name][0]
+
+    def compact(self, name):
+        """Fold the journal into a fresh snapshot.
+
+        The snapshot is built without holding the collection lock so saves
+        are not blocked; only the final rename and journal trim are locked.
+        At most one process compacts a collection at a time; others skip.
+        """
+        with file_lock(self.data_dir / f"{name}.compact.lock", blocking=False) as locked:
+            if locked:
+                self._compact(name)
+
+    def _compact(self, name):
+        with self._locks[name]:
+            snapshot_id = self._snapshot_id(name)
+            seq, records = self._read_snapshot(name)
+            entries = self._read_journal(name, seq)
+        if not entries:
+            return
+        records.extend(entry["record"] for entry in entries)
+        covered_seq = entries[-1]["seq"]
+        tmp = self._snapshot_path(name).with_name(f"{name}.snapshot.json.compact")
+        write_json_atomic(tmp, {"seq": covered_seq, "records": records})
+        with self._locks[name], self._file_lock(name):
+            if self._snapshot_id(name) != snapshot_id:
+                # Cleared while we were compacting; the new snapshot is stale
+                tmp.unlink()
+                return
+            # Written first: it covers covered_seq, and the journal keeps
+            # everything after that until the trim below
+            index = INDEXES[name](name)
+            index.extend(records)
+            write_json_atomic(self._index_path(name), {"seq": covered_seq, "data": index.to_json()})
+            stats = self._stats(name)
+            os.replace(tmp, self._snapshot_path(name))
+            _fsync_dir(self.data_dir)
+            self._remove_legacy(name)
+            self._rewrite_journal(name, self._read_journal(name, covered_seq))
+            # Compaction leaves the records and so the version unchanged;
+            # only the sequence number's file stats have to follow it
+            if self._seq_stats.get(name) == stats:
+                self._seq_stats[name] = self._stats(name)
+
+    def _compact_in_background(self, name):
+        try:
+            self.compact(name)
+        finally:
+            with self._locks[name]:
+                self._compacting.discard(name)
+
+    def _stats(self, name):
+        return _file_stats([self._snapshot_path(name), self._journal_path(name)])
+
+    def version(self, name):
+        """Return a token that changes whenever a collection's contents change.
+
+        For collections it is the last sequence number written (clearing
+        takes one too), so a compaction, which rewrites the files without
+        changing their records, keeps the version. It is only re-read when
+        the files change. The profile's version is its file's stat.
+        """
+        if name == "user_data":
+            return _file_stats([self.data_dir / "user_data.json"])
+        stats = self._stats(name)
+        known = self._versions.get(name)
+        if known is None or known[0] != stats:
+            known = self._versions[name] = (stats, self._written_seq(name))
+        return known[1]
+
+    def _written_seq(self, name):
+        """Return the sequence number of the last complete journal line, else the snapshot's.
+
+        Reads only the end of the journal and the start of the snapshot,
+        unless a damaged line forces a full read. Never repairs anything,
+        so it is safe without the file lock.
+        """
+        try:
+            with open(self._journal_path(name), "rb") as f:
+                f.seek(max(0, f.seek(0, os.SEEK_END) - 65536))
+                lines = f.read().split(b"\n")[:-1]
+        except FileNotFoundError:
+            lines = []
+        if lines:
+            try:
+                return json.loads(lines[-1])["seq"]
+            except (ValueError, KeyError):
+                seq, _ = self._read_snapshot(name)
+                entries = self._read_journal(name, seq)
+                return entries[-1]["seq"] if entries else seq
+        try:
+            with open(self._snapshot_path(name), "rb") as f:
+                head = f.read(64)
+        except FileNotFoundError:
+            return 0
+        # Snapshots are written as {"seq": n, "records": [...]}
+        match = re.match(rb'\{"seq": (\d+)', head)
+        return int(match.group(1)) if match else self._read_snapshot(name)[0]
+
+    def revision(self, name):
+        """Return a JSON-serializable token identifying a collection's contents.
+
+        Sequence numbers and file stats survive restarts, so the token can
+        be stored next to derived data to tell whether it is still current.
+        """
+        return json.loads(json.dumps(self.version(name)))
+
+    def _index(self, name):
+        """Return a collection's derived index, restoring it if the records changed"""
+        with self._locks[name]:
+            version = self.version(name)
+            if name not in self._indexes or self._indexes[name][0] != version:
+                self._indexes[name] = (version, self._read_consistent(name, lambda: self._read_index(name)))
+            return self._indexes[name][1]
+
+    def _read_index(self, name):
+        path = self._index_path(name)
+        if path.exists():
+            with open(path, "r") as f:
+                stored = json.load(f)
+            index = INDEXES[name](name, stored["data"])
+            seq = stored["seq"]
+        else:
+            seq, records = self._read_snapshot(name)
+            index = INDEXES[name](name)
+            index.extend(records)
+        index.extend(entry["record"] for entry in self._read_journal(name, seq))
+        return index
+
+    def daily_summary(self, start, end):
+        """Return workout and calorie totals for each day in a range"""
+        return summarize(start, end, *(self._index(name) for name in ROLLUP_FIELDS))
+
+    def personal_records(self, exercise):
+        """Return one exercise's personal records, or None if never logged"""
+        return self._index("strength_logs").get(exercise)
+
+    def _last_seq(self, name):
+        """Return the last sequence number written, repairing a torn journal tail.
+
+        Called under the file lock. Normally only the end of the journal is
+        read; the snapshot is only parsed when the journal is empty.
+        """
+        path = self._journal_path(name)
+        size = path.stat().st_size if path.exists() else 0
+        if size:
+            with open(path, "rb") as f:
+                f.seek(max(0, size - 65536))
+                tail = f.read()
+            if tail.endswith(b"\n"):
+                try:
+                    return json.loads(tail.rsplit(b"\n", 2)[-2])["seq"]
+                except (IndexError, ValueError, KeyError):
+                    pass
+        seq, _ = self._read_snapshot(name)
+        entries = self._read_journal(name, seq, repair=True)
+        return entries[-1]["seq"] if entries else seq
+
+    def _rewrite_journal(self, name, entries):
+        """Atomically replace the journal with the given entries"""
+        path = self._journal_path(name)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.data_dir)
+        self._journal_len[name] = len(entries)
+
+    def _remove_legacy(self, name):
+        """Remove a pre-journal JSON file once a snapshot supersedes it"""
+        legacy = self._legacy_path(name)
+        if legacy.exists():
+            legacy.unlink()
+
+    def load_user_data(self):
+        """Load the profile dict"""
+        path = self.data_dir / "user_data.json"
+        if not path.exists():
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def save_user_data(self, user_data, expected=None):
+        """Atomically replace the profile dict; returns the versions before and after"""
+        with self._file_lock("user_data"):
+            self._check_revision("user_data", expected)
+            version = self.version("user_data")
+            write_json_atomic(self.data_dir / "user_data.json", user_data)
+            return version, self.version("user_data")
+
+
+class SQLiteStore:
+    """SQLite storage with indexed date and category columns.
+
+    Each collection is a table holding the full record as JSON next to the
+    columns the pages filter on, so date ranges and equality filters are
+    served by indexes instead of scanning every record.
+    """
+
+    indexed = True
+
+    def __init__(self, data_dir, filename="tracker.db"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        db_path = self.data_dir / filename
+        is_new = not db_path.exists()
+        self._lock = threading.Lock()
+        self._changes = {name: 0 for name in COLLECTIONS + ["user_data"]}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._create_schema()
+        if is_new:
+            migrate_json_dir(self, self.data_dir)
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            for name, fields in INDEXED_FIELDS.items():
+                columns = "".join(f", {field} TEXT" for field in fields)
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} "
+                    f"(id INTEGER PRIMARY KEY, date TEXT NOT NULL{columns}, data TEXT NOT NULL)"
+                )
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_date ON {name} (date)")
+                for field in fields:
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {name}_{field} ON {name} ({field}, date)"
+                    )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS revisions "
+                "(name TEXT PRIMARY KEY, revision INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_data "
+                "(id INTEGER PRIMARY KEY CHECK (id = 1), data TEXT NOT NULL)"
+            )
+            has_rollups = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'workouts_daily'"
+            ).fetchone()
+            for name, fields in ROLLUP_FIELDS.items():
+                columns = "".join(f", {field} NUMERIC NOT NULL DEFAULT 0" for field in fields)
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name}_daily (date TEXT PRIMARY KEY{columns})"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS workouts_daily_category "
+                "(date TEXT NOT NULL, category TEXT NOT NULL, minutes NUMERIC NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (date, category))"
+            )
+            if not has_rollups:
+                for name in ROLLUP_FIELDS:
+                    rows = self._conn.execute(f"SELECT data FROM {name}").fetchall()
+                    self._add_to_rollup(name, [json.loads(data) for data, in rows])
+            has_records = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'personal_record_progress'"
+            ).fetchone()
+            if not has_records:
+                # Older databases kept every list of an exercise's records in one JSON blob
+                self._conn.execute("DROP TABLE IF EXISTS personal_records")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS personal_records "
+                "(exercise TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS personal_record_reps (exercise TEXT NOT NULL, "
+                "weight REAL NOT NULL, reps NUMERIC NOT NULL, PRIMARY KEY (exercise, weight))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS personal_record_progress (exercise TEXT NOT NULL, "
+                "day TEXT NOT NULL, top_weight REAL NOT NULL, PRIMARY KEY (exercise, day))"
+            )
+            if not has_records:
+                rows = self._conn.execute("SELECT data FROM strength_logs ORDER BY id").fetchall()
+                self._add_to_records([json.loads(data) for data, in rows])
+
+    def _row(self, name, record):
+        return ([day_key(record["date"])]
+                + [record.get(field) for field in INDEXED_FIELDS[name]]
+                + [_encoder.encode(record)])
+
+    def _add_to_rollup(self, name, records):
+        """Upsert each record's increments into the daily rollup tables"""
+        if name not in ROLLUP_FIELDS:
+            return
+        fields = ROLLUP_FIELDS[name]
+        updates = ", ".join(f"{field} = {field} + excluded.{field}" for field in fields)
+        self._conn.executemany(
+            f"INSERT INTO {name}_daily (date, {', '.join(fields)}) "
+            f"VALUES (?{', ?' * len(fields)}) ON CONFLICT (date) DO UPDATE SET {updates}",
+            [[day_key(r["date"])] + [record_increments(name, r)[f] for f in fields]
+             for r in records],
+        )
+        if name == "workouts":
+            self._conn.executemany(
+                "INSERT INTO workouts_daily_category (date, category, minutes) VALUES (?, ?, ?) "
+                "ON CONFLICT (date, category) DO UPDATE SET minutes = minutes + excluded.minutes",
+                [(day_key(r["date"]), r.get("category", "Other"), r.get("minutes", 0))
+                 for r in records],
+            )
+
+    def _add_to_records(self, entries):
+        """Update the personal records of each exercise in ``entries``.
+
+        The scalar bests are one small row per exercise; the best reps per
+        weight and the top weight per day are upserted by primary key, so a
+        save costs O(log n) however long the exercise's history is.
+        """
+        entries = [clean_entry(entry) for entry in entries]
+        by_exercise = {}
+        for entry in entries:
+            by_exercise.setdefault(_exercise_key(entry), []).append(entry)
+        for exercise, exercise_entries in by_exercise.items():
+            row = self._conn.execute(
+                "SELECT data FROM personal_records WHERE exercise = ?", (exercise,)
+            ).fetchone()
+            bests = json.loads(row[0]) if row else None
+            for entry in exercise_entries:
+                bests = update_bests(bests, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO personal_records (exercise, data) VALUES (?, ?)",
+                (exercise, json.dumps(bests)),
+            )
+        self._conn.executemany(
+            "INSERT INTO personal_record_reps (exercise, weight, reps) VALUES (?, ?, ?) "
+            "ON CONFLICT (exercise, weight) DO UPDATE SET reps = MAX(reps, excluded.reps)",
+            [(_exercise_key(entry), entry["weight"], entry["reps"]) for entry in entries],
+        )
+        self._conn.executemany(
+            "INSERT INTO personal_record_progress (exercise, day, top_weight) VALUES (?, ?, ?) "
+            "ON CONFLICT (exercise, day) DO UPDATE SET top_weight = MAX(top_weight, excluded.top_weight)",
+            [(_exercise_key(entry), day_key(entry["date"]), entry["weight"]) for entry in entries],
+        )
+
+    def load(self, name):
+        """Load every record of a collection in insertion order"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT data FROM {name} ORDER BY id").fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def load_recent(self, name, after=0, start=None):
+        """Return ``(records, last)``: the records after row id ``after`` plus those dated from ``start`` on.
+
+        Both conditions are served by indexes. ``last`` is the newest row
+        id, to pass as ``after`` next time.
+        """
+        where, params = "id > ?", [after]
+        if start is not None:
+            where += " OR date >= ?"
+            params.append(day_key(start))
+        with self._lock:
+            last = self._conn.execute(f"SELECT MAX(id) FROM {name}").fetchone()[0] or 0
+            rows = self._conn.execute(f"SELECT data FROM {name} WHERE {where} ORDER BY id", params).fetchall()
+        return [json.loads(data) for data, in rows], last
+
+    def append(self, name, record):
+        """Durably insert one record"""
+        self.extend(name, [record])
+
+    def _begin(self, name, expected):
+        """Start a write transaction, checking the revision ``expected`` by the caller"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        if expected is not None and self._revision(name) != expected:
+            raise ConflictError(f"{name} was changed by another writer")
+
+    def extend(self, name, records, expected=None):
+        """Durably insert records in a single transaction.
+
+        Returns the collection's versions just before and after the write,
+        both read inside the transaction.
+        """
+        fields = ["date"] + INDEXED_FIELDS[name] + ["data"]
+        placeholders = ", ".join("?" for _ in fields)
+        with self._lock, self._conn:
+            self._begin(name, expected)
+            version = self._version(name)
+            self._conn.executemany(
+                f"INSERT INTO {name} ({', '.join(fields)}) VALUES ({placeholders})",
+                [self._row(name, record) for record in records],
+            )
+            self._add_to_rollup(name, records)
+            if name == "strength_logs":
+                self._add_to_records(records)
+            self._bump_revision(name)
+            self._changes[name] += 1
+            return version, self._version(name)
+
+    def clear(self, name, expected=None):
+        """Drop every record of a collection; returns the versions before and after"""
+        with self._lock, self._conn:
+            self._begin(name, expected)
+            version = self._version(name)
+            self._conn.execute(f"DELETE FROM {name}")
+            if name in ROLLUP_FIELDS:
+                self._conn.execute(f"DELETE FROM {name}_daily")
+            if name == "workouts":
+                self._conn.execute("DELETE FROM workouts_daily_category")
+            if name == "strength_logs":
+                for table in ("personal_records", "personal_record_reps", "personal_record_progress"):
+                    self._conn.execute(f"DELETE FROM {table}")
+            self._bump_revision(name)
+            self._changes[name] += 1
+            return version, self._version(name)
+
+    def query(self, name, start=None, end=None, **equals):
+        """Return records in date order, filtered by date range and fields"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(day_key(start))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(day_key(end))
+        for field, value in equals.items():
+            if field not in INDEXED_FIELDS[name]:
+                raise ValueError(f"{name} cannot be filtered by {field}")
+            clauses.append(f"{field} = ?")
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM {name}{where} ORDER BY date, id", params
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def distinct(self, name, field):
+        """Return the sorted distinct values of an indexed field"""
+        if field not in INDEXED_FIELDS[name]:
+            raise ValueError(f"{name} has no indexed field {field}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT {field} FROM {name} WHERE {field} IS NOT NULL ORDER BY {field}"
+            ).fetchall()
+        return [value for value, in rows]
+
+    def daily_summary(self, start, end):
+        """Return workout and calorie totals for each day in a range"""
+        params = (day_key(start), day_key(end))
+        rollups = {}
+        with self._lock:
+            for name, fields in ROLLUP_FIELDS.items():
+                rollup = DailyRollup(name)
+                rows = self._conn.execute(
+                    f"SELECT date, {', '.join(fields)} FROM {name}_daily "
+                    f"WHERE date BETWEEN ? AND ?", params
+                ).fetchall()
+                for row in rows:
+                    rollup.days[row[0]] = dict(zip(fields, row[1:]))
+                rollups[name] = rollup
+            rows = self._conn.execute(
+                "SELECT date, category, minutes FROM workouts_daily_category "
+                "WHERE date BETWEEN ? AND ?", params
+            ).fetchall()
+        for day, category, minutes in rows:
+            rollups["workouts"].days[day].setdefault("categories", {})[category] = minutes
+        return summarize(start, end, *rollups.values())
+
+    def personal_records(self, exercise):
+        """Return one exercise's personal records, or None if never logged"""
+        key = _exercise_key({"exercise": exercise})
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM personal_records WHERE exercise = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            reps = self._conn.execute(
+                "SELECT weight, reps FROM personal_record_reps WHERE exercise = ? ORDER BY weight", (key,)
+            ).fetchall()
+            progress = self._conn.execute(
+                "SELECT day, top_weight FROM personal_record_progress WHERE exercise = ? ORDER BY day",
+                (key,)
+            ).fetchall()
+        return {**json.loads(row[0]), "weights": [weight for weight, _ in reps],
+                "reps": [count for _, count in reps], "progress": [list(day) for day in progress]}
+
+    def load_user_data(self):
+        """Load the profile dict"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM user_data WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_user_data(self, user_data, expected=None):
+        """Replace the profile dict; returns the versions before and after"""
+        with self._lock, self._conn:
+            self._begin("user_data", expected)
+            version = self._version("user_data")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_data (id, data) VALUES (1, ?)",
+                (json.dumps(user_data, default=str),),
+            )
+            self._bump_revision("user_data")
+            self._changes["user_data"] += 1
+            return version, self._version("user_data")
+
+    def _bump_revision(self, name):
+        self._conn.execute(
+            "INSERT INTO revisions (name, revision) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET revision = revision + 1", (name,)
+        )
+
+    def _revision(self, name):
+        row = self._conn.execute(
+            "SELECT revision FROM revisions WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def revision(self, name):
+        """Return a persistent counter incremented by every write to a collection"""
+        with self._lock:
+            return self._revision(name)
+
+    def version(self, name):
+        """Return a token that changes whenever a collection is written.
+
+        ``data_version`` moves when another connection commits; our own
+        writes are counted per collection, since committing them does not
+        move our own connection's ``data_version``.
+        """
+        with self._lock:
+            return self._version(name)
+
+    def _version(self, name):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0], self._changes[name]
+
+
+BACKENDS = {
+    "json": JournalStore,
+    "sqlite": SQLiteStore,
+}
+
+
+def open_store(data_dir, backend=None):
+    """Open the storage backend named by ``backend`` or $WORKOUT_STORAGE"""
+    backend = backend or os.environ.get("WORKOUT_STORAGE", "sqlite")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return BACKENDS[backend](data_dir)
+
+
+class SharedStore:
+    """Process-wide, in-memory view of a storage backend.
+
+    Collections are loaded once into columnar tables and shared by every
+    session until the backend reports a new version for them (for example
+    after another process wrote to the same data). Writes made through this
+    object are appended to the cached tables in place, so saving a record
+    never forces a reload. Returned tables and frames are shared and must
+    be treated as read-only.
+
+    With ``snapshots`` (a ``snapshot.SnapshotDir``) tables are opened from
+    memory-mapped binary snapshots when those match the backend revision,
+    and the snapshots are refreshed in the background after writes.
+
+    With ``segments`` (a ``segments.SegmentDir``) closed months are kept in
+    immutable segments with precomputed totals and only the hot part (this
+    month plus records added since the last seal) is loaded from storage.
+    Totals are read through ``summaries`` and ``hot``; ``table`` and the
+    functions built on it (paging, export) read the segments on first use.
+    """
+
+    def __init__(self, backend, snapshots=None, segments=None):
+        self.backend = backend
+        self.snapshots = snapshots
+        self.segments = segments
+        self._lock = threading.RLock()
+        self._cache = {}
+        self._pending_snapshots = set()
+        self._snapshot_timer = None
+
+    def _cached(self, name, loader, key=None):
+        key = key or name
+        with self._lock:
+            version = self.backend.version(name)
+            cached = self._cache.get(key)
+            if cached is None or cached[0] != version:
+                cached = self._cache[key] = (version, loader())
+            return cached[1]
+
+    def table(self, name):
+        """Return a whole collection as a ColumnTable"""
+        if self.segments is None:
+            return self._cached(name, lambda: self._load_table(name))
+
+        def load():
+            manifest, hot = self._tier(name)
+            parts = [self.segments.read(name, segment) for segment in manifest["segments"]]
+            return ColumnTable.concat(name, parts + [hot])
+        return self._cached(name, load)
+
+    def _tier(self, name):
+        """Return ``(segment manifest, hot table)`` of a collection, sealing months that closed"""
+        hot_start = date.today().replace(day=1).isoformat()
+        with self._lock:
+            tier = self._cached(name, lambda: self._load_tier(name, hot_start), key=(name, "tier"))
+            if tier[0]["hot_start"] != hot_start:
+                tier = self._load_tier(name, hot_start)
+                self._cache[(name, "tier")] = (self.backend.version(name), tier)
+            return tier
+
+    def _tier_revision(self, name, manifest):
+        return [self.backend.revision(name), manifest["watermark"], manifest["hot_start"]]
+
+    def _load_tier(self, name, hot_start):
+        with self.segments.lock(name):
+            manifest = self.segments.manifest(name)
+            if self.snapshots is not None and manifest["hot_start"] == hot_start:
+                hot = self.snapshots.read(name, self._tier_revision(name, manifest))
+                if hot is not None:
+                    return manifest, hot
+            records, last = self.backend.load_recent(name, manifest["watermark"], manifest["hot_start"])
+            if last < manifest["watermark"]:
+                # The collection was cleared without dropping its segments
+                self.segments.clear(name)
+                manifest = self.segments.manifest(name)
+                records, last = self.backend.load_recent(name)
+            hot = ColumnTable.from_records(name, records)
+            if manifest["hot_start"] != hot_start:
+                manifest, hot = self.segments.seal(name, hot, last, hot_start)
+        self._schedule_snapshot(name)
+        return manifest, hot
+
+    def hot(self, name):
+        """Return the rows of a collection not in segments (all rows without segments)"""
+        return self._tier(name)[1] if self.segments is not None else self.table(name)
+
+    def summaries(self, name):
+        """Return the precomputed totals of each sealed segment (see ``segments.summarize``)"""
+        return self._tier(name)[0]["segments"] if self.segments is not None else []
+
+    def count(self, name):
+        """Return the number of records in a collection"""
+        return len(self.hot(name)) + sum(summary["rows"] for summary in self.summaries(name))
+
+    def date_span(self, name):
+        """Return the first and last date of a collection, or None when it is empty"""
+        hot = self.hot(name)
+        with self._lock:
+            index = hot.date_index()
+        ordinals = [ordinal for summary in self.summaries(name)
+                    for ordinal in (summary["first"], summary["last"])]
+        if len(index):
+            ordinals += [int(index[0] >> 32), int(index[-1] >> 32)]
+        return (date.fromordinal(min(ordinals)), date.fromordinal(max(ordinals))) if ordinals else None
+
+    def latest(self, name, count):
+        """Return the ``count`` most recent records, newest first"""
+        if self.segments is not None:
+            manifest, hot = self._tier(name)
+            with self._lock:
+                records = hot.latest(count)
+            # Hot rows from this month on are newer than anything in a segment
+            if len(records) == count and records[-1]["date"] >= manifest["hot_start"]:
+                return records
+        table = self.table(name)
+        with self._lock:
+            return table.latest(count)
+
+    def _load_table(self, name):
+        if self.snapshots is not None:
+            table = self.snapshots.read(name, self.backend.revision(name))
+            if table is not None:
+                return table
+        table = ColumnTable.from_records(name, self.backend.load(name))
+        self._schedule_snapshot(name)
+        return table
+
+    def _schedule_snapshot(self, name):
+        if self.snapshots is None:
+            return
+        with self._lock:
+            self._pending_snapshots.add(name)
+            if self._snapshot_timer is None:
+                self._snapshot_timer = threading.Timer(SNAPSHOT_DELAY, self.write_snapshots)
+                self._snapshot_timer.daemon = True
+                self._snapshot_timer.start()
+
+    def write_snapshots(self):
+        """Write binary snapshots of the tables changed since the last call"""
+        with self._lock:
+            pending = self._pending_snapshots
+            self._pending_snapshots = set()
+            self._snapshot_timer = None
+            states = []
+            for name in pending:
+                cached = self._cache.get(name if self.segments is None else (name, "tier"))
+                if cached is None or cached[0] != self.backend.version(name):
+                    continue
+                if self.segments is None:
+                    table, revision = cached[1], self.backend.revision(name)
+                else:
+                    table, revision = cached[1][1], self._tier_revision(name, cached[1][0])
+                dictionaries = {field: list(values) for field, values in table.dictionaries.items()}
+                states.append((table, table.length, dictionaries, revision))
+        # Rows below the captured length never change, so the columns can
+        # be written without holding the lock
+        for state in states:
+            self.snapshots.write(*state)
+
+    def frame(self, name):
+        """Return a collection as a cached, read-only DataFrame"""
+        table = self.table(name)
+        with self._lock:
+            return table.frame()
+
+    def load(self, name):
+        """Return a collection's records, read straight from the backend"""
+        return self.backend.load(name)
+
+    def load_user_data(self):
+        """Return the profile dict"""
+        return self._cached("user_data", self.backend.load_user_data)
+
+    def revision(self, name):
+        """Return the persistent revision of a collection or "user_data" """
+        return self.backend.revision(name)
+
+    def version(self, *names):
+        """Return a token covering the named collections (default: all and the profile)"""
+        return tuple(self.backend.version(name) for name in names or COLLECTIONS + ["user_data"])
+
+    def _write(self, name, write, updates):
+        """Run a backend write and patch the cached values that were current.
+
+        ``updates`` maps cache keys derived from the collection to functions
+        returning the patched value. ``write`` returns the versions just
+        before and after it, read under the backend's lock, so only entries
+        loaded at the version before are patched and stamped with the one
+        after; any other entry may have missed another writer and is dropped.
+        """
+        with self._lock:
+            before, after = write()
+            current = {key: self._cache[key][1] for key in updates
+                       if key in self._cache and self._cache[key][0] == before}
+            for key, update in updates.items():
+                if key in current:
+                    self._cache[key] = (after, update(current[key]))
+                else:
+                    self._cache.pop(key, None)
+            if (name in current or (name, "tier") in current) and name in COLLECTIONS:
+                self._schedule_snapshot(name)
+
+    def append(self, name, record):
+        """Save one record"""
+        self.extend(name, [record])
+
+    def extend(self, name, records, expected=None):
+        """Save several records in one write.
+
+        ``expected`` is a revision (see ``revision``) the collection must
+        still be at; ConflictError is raised if another writer got there
+        first.
+        """
+        records = list(records)
+
+        def update(cached):
+            cached.extend(records)
+            return cached
+
+        def update_tier(tier):
+            tier[1].extend(records)
+            return tier
+        self._write(name, lambda: self.backend.extend(name, records, expected),
+                    {name: update, (name, "rolling"): update, (name, "tier"): update_tier})
+
+    def clear(self, name, expected=None):
+        """Drop every record of a collection, and its segments in one step per segment"""
+        def write():
+            # Segments go first: if clearing storage then fails, they are rebuilt
+            if self.segments is not None:
+                self.segments.clear(name)
+            return self.backend.clear(name, expected)
+        self._write(name, write,
+                    {name: lambda table: ColumnTable(name),
+                     (name, "rolling"): lambda windows: RollingWindows(name, windows.today),
+                     (name, "tier"): lambda tier: (self.segments.manifest(name), ColumnTable(name))})
+
+    def save_user_data(self, user_data, expected=None):
+        """Replace the profile dict, optionally only if still at ``expected``"""
+        self._write("user_data", lambda: self.backend.save_user_data(user_data, expected),
+                    {"user_data": lambda cached: user_data})
+
+    def query(self, name, start=None, end=None, **equals):
+        """Return records in date order, filtered by date range and fields.
+
+        With segments only the hot rows and the segments whose dates
+        overlap the range are read, never the whole history.
+        """
+        if self.backend.indexed:
+            return self.backend.query(name, start, end, **equals)
+        if self.segments is None:
+            parts = [self.table(name)]
+        else:
+            manifest, hot = self._tier(name)
+            first = to_ordinal(start) if start is not None else -np.inf
+            last = to_ordinal(end) if end is not None else np.inf
+            parts = [self.segments.read(name, segment) for segment in manifest["segments"]
+                     if segment["last"] >= first and segment["first"] <= last] + [hot]
+        records, dates = [], []
+        for table in parts:
+            with self._lock:
+                rows = np.flatnonzero(table.mask(start, end, **equals))
+                dates.append(table.columns["date"][rows])
+                records.extend(table.records(rows))
+        return [records[i] for i in np.argsort(np.concatenate(dates), kind="stable")]
+
+    def distinct(self, name, field, **equals):
+        """Return the sorted distinct values of a category field"""
+        if self.segments is None or len(equals) > 1:
+            table = self.table(name)
+            with self._lock:
+                return table.distinct(field, **equals)
+        hot = self.hot(name)
+        with self._lock:
+            values = set(hot.distinct(field, **equals))
+        for summary in self.summaries(name):
+            if equals:
+                (by, value), = equals.items()
+                values.update(summary["groups"][f"{field}/{by}"].get(value, ()))
+            else:
+                values.update(summary["distinct"][field])
+        return sorted(values)
+
+    def page(self, name, limit, before=None, fields=None, **equals):
+        """Return one page of records, newest first, and the next page's cursor.
+
+        With segments the records from ``hot_start`` on are paged from the
+        hot rows alone; the whole history is only loaded once a page goes
+        past them. Cursors are then ``(tier, key)`` pairs.
+        """
+        if self.segments is None:
+            table = self.table(name)
+            with self._lock:
+                return table.page(limit, before, fields, **equals)
+        tier, key = before or ("hot", None)
+        manifest, hot = self._tier(name)
+        # Every key of a record dated before hot_start is below this one
+        boundary = to_ordinal(manifest["hot_start"]) << 32
+        records = []
+        if tier == "hot":
+            with self._lock:
+                records, cursor = hot.page(limit, key, fields, start=manifest["hot_start"], **equals)
+                older = len(hot) and hot.date_index()[0] < boundary
+            if cursor is not None:
+                return records, ("hot", cursor)
+            if not manifest["segments"] and not older:
+                return records, None
+            if len(records) == limit:
+                return records, ("all", boundary)
+            key = boundary
+        table = self.table(name)
+        with self._lock:
+            more, cursor = table.page(limit - len(records), key, fields, **equals)
+        return records + more, None if cursor is None else ("all", cursor)
+
+    def _date_rows(self, name, start, end):
+        table = self.table(name)
+        with self._lock:
+            return table, table.frame(), table.date_rows(start, end)
+
+    def iter_frames(self, name, chunk_size, start=None, end=None):
+        """Yield the records in a date range as DataFrame chunks, oldest first.
+
+        Rows are picked from the date index up front and each chunk is
+        copied out of the shared frame only when it is requested, so memory
+        use is bounded by the chunk size. Fields outside the schema are left
+        out; use ``iter_records`` to keep them.
+        """
+        _, frame, rows = self._date_rows(name, start, end)
+        for i in range(0, len(rows), chunk_size):
+            yield frame.iloc[rows[i:i + chunk_size]]
+
+    def iter_records(self, name, chunk_size, start=None, end=None):
+        """Yield the records in a date range as lists of dicts, oldest first"""
+        table, _, rows = self._date_rows(name, start, end)
+        for i in range(0, len(rows), chunk_size):
+            with self._lock:
+                chunk = table.records(rows[i:i + chunk_size])
+            yield chunk
+
+    def daily_summary(self, start, end):
+        """Return workout and calorie totals for each day in a range"""
+        return self.backend.daily_summary(start, end)
+
+    def personal_records(self, exercise):
+        """Return one exercise's personal records, or None if never logged"""
+        return self.backend.personal_records(exercise)
+
+    def rolling(self, name, today=None):
+        """Return trailing-window totals of a rolled-up collection ending today.
+
+        The windows are seeded from the daily rollup once per day and then
+        patched by every write, so reading them is O(1).
+        """
+        today = today or date.today()
+
+        def load():
+            start = today - timedelta(days=max(WINDOWS) - 1)
+            return RollingWindows(name, today, self.backend.daily_summary(start, today))
+        with self._lock:
+            windows = self._cached(name, load, key=(name, "rolling"))
+            if windows.today != today:
+                windows = load()
+                self._cache[(name, "rolling")] = (self.backend.version(name), windows)
+            return windows
+
+
+def export_data(store):
+    """Return every collection and the profile as one JSON-serializable dict"""
+    data = {name: store.load(name) for name in COLLECTIONS}
+    data["user_data"] = store.load_user_data()
+    return data
+
+
+def import_data(store, data):
+    """Add the collections of an exported dict to a store"""
+    for name in COLLECTIONS:
+        store.extend(name, data.get(name, []))
+    if data.get("user_data"):
+        store.save_user_data(data["user_data"])
+
+
+def migrate_json_dir(store, directory):
+    """Copy JSON/journal data from ``directory`` into another backend"""
+    directory = Path(directory)
+    if not any(directory.glob("*.json*")):
+        return
+    import_data(store, export_data(JournalStore(directory)))
@@ -0,0 +1,46 @@
+import numpy as np
+
+from columnar import ColumnTable
+from segments import SegmentDir
+from snapshot import SnapshotDir
+
+# More distinct foods than an int16 code can number
+FOODS = 33_000
+
+
+def meals(count, offset=0):
+    return [{"date": f"2026-10-{i % 28 + 1:02d}", "meal_type": "Lunch", "food": f"food {i + offset}",
+             "intake": i % 900, "protein": 1.0, "carbs": 2.0, "fats": 3.0, "notes": ""}
+            for i in range(count)]
+
+
+def test_category_codes_widen_past_int16():
+    table = ColumnTable.from_records("calories", meals(FOODS))
+    assert table.columns["food"].dtype == np.int32
+    assert [record["food"] for record in table.records()] == [f"food {i}" for i in range(FOODS)]
+    assert table.frame()["food"].tolist()[-1] == f"food {FOODS - 1}"
+    table.append(meals(1, offset=FOODS)[0])
+    assert table.records([FOODS])[0]["food"] == f"food {FOODS}"
+
+
+def test_concat_and_take_keep_wide_codes():
+    small = ColumnTable.from_records("calories", meals(10))
+    large = ColumnTable.from_records("calories", meals(FOODS, offset=10))
+    table = ColumnTable.concat("calories", [small, large])
+    assert table.columns["food"].dtype == np.int32
+    assert [record["food"] for record in table.records([0, FOODS + 9])] == ["food 0", f"food {FOODS + 9}"]
+    assert table.take([FOODS + 9]).records()[0]["food"] == f"food {FOODS + 9}"
+
+
+def test_snapshots_and_segments_keep_wide_codes(tmp_path):
+    table = ColumnTable.from_records("calories", meals(FOODS))
+    snapshots = SnapshotDir(tmp_path / "columns")
+    snapshots.write(table, table.length, table.dictionaries, 1)
+    assert snapshots.read("calories", 1).frame()["food"].tolist() == [f"food {i}" for i in range(FOODS)]
+
+    segments = SegmentDir(tmp_path / "segments")
+    with segments.lock("calories"):
+        manifest, _ = segments.seal("calories", table, table.length, "2026-11-01")
+    parts = [segments.read("calories", segment) for segment in manifest["segments"]]
+    assert sorted(record["food"] for part in parts for record in part.records()) == \
+        sorted(f"food {i}" for i in range(FOODS))
@@ -0,0 +1,206 @@
+from datetime import date, timedelta
+
+import pytest
+
+import storage
+from segments import SegmentDir
+from storage import ConflictError, JournalStore, SharedStore, existing_users, open_store
+
+BACKENDS = list(storage.BACKENDS)
+
+
+def workout(day, minutes=30):
+    return {"date": f"2026-10-{day:02d}", "minutes": minutes, "category": "Cardio", "notes": ""}
+
+
+def dates(records):
+    return [record["date"] for record in records]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
+
+def during_compaction(monkeypatch, action):
+    """Run ``action`` while a compaction writes its new snapshot, before the swap"""
+    write = storage.write_json_atomic
+
+    def write_and_act(path, data):
+        write(path, data)
+        if str(path).endswith(".compact"):
+            action()
+    monkeypatch.setattr(storage, "write_json_atomic", write_and_act)
+
+
+def test_torn_final_journal_line_is_dropped_and_repaired(tmp_path):
+    store = JournalStore(tmp_path)
+    store.extend("workouts", [workout(1), workout(2)])
+    journal = tmp_path / "workouts.jsonl"
+    with open(journal, "ab") as f:
+        f.write(b'{"seq": 3, "record": {"date": "2026-10-')
+
+    reopened = JournalStore(tmp_path)
+    assert dates(reopened.load("workouts")) == ["2026-10-01", "2026-10-02"]
+    reopened.append("workouts", workout(3))
+    assert dates(JournalStore(tmp_path).load("workouts")) == ["2026-10-01", "2026-10-02", "2026-10-03"]
+    assert journal.read_bytes().endswith(b"}\n")
+
+
+def test_torn_line_with_newline_is_repaired(tmp_path):
+    store = JournalStore(tmp_path)
+    store.append("workouts", workout(1))
+    with open(tmp_path / "workouts.jsonl", "ab") as f:
+        f.write(b'{"seq": 2, "rec\n')
+
+    reopened = JournalStore(tmp_path)
+    reopened.append("workouts", workout(2))
+    assert dates(JournalStore(tmp_path).load("workouts")) == ["2026-10-01", "2026-10-02"]
+
+
+def test_append_during_compaction_is_kept(tmp_path, monkeypatch):
+    compactor, writer = JournalStore(tmp_path), JournalStore(tmp_path)
+    compactor.extend("workouts", [workout(1), workout(2)])
+    during_compaction(monkeypatch, lambda: writer.append("workouts", workout(3)))
+    compactor.compact("workouts")
+    monkeypatch.undo()
+
+    expected = ["2026-10-01", "2026-10-02", "2026-10-03"]
+    assert dates(JournalStore(tmp_path).load("workouts")) == expected
+    # Both instances keep numbering after the highest sequence
+    compactor.append("workouts", workout(4))
+    writer.append("workouts", workout(5))
+    assert dates(JournalStore(tmp_path).load("workouts")) == expected + ["2026-10-04", "2026-10-05"]
+    assert JournalStore(tmp_path).daily_summary("2026-10-03", "2026-10-05")["2026-10-04"]["sessions"] == 1
+
+
+def test_clear_during_compaction_wins(tmp_path, monkeypatch):
+    compactor, clearer = JournalStore(tmp_path), JournalStore(tmp_path)
+    compactor.extend("workouts", [workout(1), workout(2)])
+    during_compaction(monkeypatch, lambda: clearer.clear("workouts"))
+    compactor.compact("workouts")
+    monkeypatch.undo()
+
+    assert JournalStore(tmp_path).load("workouts") == []
+    assert not list(tmp_path.glob("*.compact"))
+    compactor.append("workouts", workout(3))
+    assert dates(JournalStore(tmp_path).load("workouts")) == ["2026-10-03"]
+
+
+def test_compaction_keeps_version_and_cache(tmp_path, monkeypatch):
+    shared = SharedStore(JournalStore(tmp_path))
+    shared.extend("workouts", [workout(1), workout(2)])
+    loads = []
+    load = shared._load_table
+    monkeypatch.setattr(shared, "_load_table", lambda name: loads.append(name) or load(name))
+    assert len(shared.table("workouts")) == 2
+    seen = shared.revision("workouts")
+
+    shared.backend.compact("workouts")
+    assert shared.revision("workouts") == seen
+    assert len(shared.table("workouts")) == 2
+    shared.append("workouts", workout(3))
+    assert len(shared.table("workouts")) == 3
+    assert loads == ["workouts"]
+
+
+def test_clear_moves_version(tmp_path, backend):
+    store = open_store(tmp_path, backend)
+    store.append("workouts", workout(1))
+    seen = store.version("workouts")
+    store.clear("workouts")
+    assert store.version("workouts") != seen
+    assert open_store(tmp_path, backend).version("workouts") != seen
+
+
+def test_write_racing_another_writer_leaves_no_stale_cache(tmp_path, backend, monkeypatch):
+    shared, other = SharedStore(open_store(tmp_path, backend)), open_store(tmp_path, backend)
+    shared.append("workouts", workout(1))
+    shared.table("workouts")
+    extend = shared.backend.extend
+
+    def extend_then_other_writes(name, records, expected=None):
+        versions = extend(name, records, expected)
+        other.append(name, workout(3))
+        return versions
+    monkeypatch.setattr(shared.backend, "extend", extend_then_other_writes)
+    shared.append("workouts", workout(2))
+    assert len(shared.table("workouts")) == 3
+
+
+def test_writers_see_each_others_records(tmp_path, backend):
+    first, second = open_store(tmp_path, backend), open_store(tmp_path, backend)
+    first.append("workouts", workout(1))
+    second.append("workouts", workout(2))
+    first.append("workouts", workout(3))
+    for store in (first, second, open_store(tmp_path, backend)):
+        assert sorted(dates(store.load("workouts"))) == ["2026-10-01", "2026-10-02", "2026-10-03"]
+
+
+def test_extend_with_stale_revision_conflicts(tmp_path, backend):
+    first, second = open_store(tmp_path, backend), open_store(tmp_path, backend)
+    first.append("workouts", workout(1))
+    seen = first.revision("workouts")
+    second.append("workouts", workout(2))
+
+    with pytest.raises(ConflictError):
+        first.extend("workouts", [workout(3)], expected=seen)
+    assert sorted(dates(open_store(tmp_path, backend).load("workouts"))) == ["2026-10-01", "2026-10-02"]
+    first.extend("workouts", [workout(3)], expected=first.revision("workouts"))
+    assert len(open_store(tmp_path, backend).load("workouts")) == 3
+
+
+def test_clear_with_stale_revision_conflicts(tmp_path, backend):
+    first, second = open_store(tmp_path, backend), open_store(tmp_path, backend)
+    first.append("workouts", workout(1))
+    seen = first.revision("workouts")
+    second.append("workouts", workout(2))
+
+    with pytest.raises(ConflictError):
+        first.clear("workouts", expected=seen)
+    assert len(open_store(tmp_path, backend).load("workouts")) == 2
+    first.clear("workouts", expected=first.revision("workouts"))
+    assert open_store(tmp_path, backend).load("workouts") == []
+
+
+def test_save_user_data_with_stale_revision_conflicts(tmp_path, backend):
+    first, second = open_store(tmp_path, backend), open_store(tmp_path, backend)
+    first.save_user_data({"weight": 70})
+    seen = first.revision("user_data")
+    second.save_user_data({"weight": 72})
+
+    with pytest.raises(ConflictError):
+        first.save_user_data({"weight": 71}, expected=seen)
+    assert open_store(tmp_path, backend).load_user_data() == {"weight": 72}
+
+
+def test_existing_users_normalizes_and_rejects_unknown_profiles(tmp_path):
+    (tmp_path / "users" / "alex-smith").mkdir(parents=True)
+    assert existing_users(tmp_path) == ["default", "alex-smith"]
+    assert existing_users(tmp_path, ["Alex Smith", "alex-smith", "Default"]) == ["alex-smith", "default"]
+    with pytest.raises(ValueError, match="sam"):
+        existing_users(tmp_path, ["alex-smith", "Sam"])
+    with pytest.raises(ValueError, match="No data directory"):
+        existing_users(tmp_path / "missing", ["default"])
+    assert not (tmp_path / "users" / "sam").exists()
+
+
+def test_query_reads_only_segments_overlapping_the_range(tmp_path, monkeypatch):
+    first = date.today().replace(day=1)
+    months = [(first - timedelta(days=31 * back)).replace(day=10) for back in (3, 2, 1, 0)]
+    JournalStore(tmp_path).extend("workouts", [{**workout(1), "date": str(day)} for day in months])
+    segments = SegmentDir(tmp_path / "segments")
+    shared = SharedStore(JournalStore(tmp_path), segments=segments)
+    assert len(shared.summaries("workouts")) == 3
+
+    reads = []
+    read = segments.read
+
+    def counted_read(name, segment):
+        reads.append(segment["month"])
+        return read(name, segment)
+    monkeypatch.setattr(segments, "read", counted_read)
+    assert dates(shared.query("workouts", months[1], months[3])) == [str(day) for day in months[1:]]
+    assert reads == [str(months[1])[:7], str(months[2])[:7]]
+    assert dates(shared.query("workouts", months[3])) == [str(months[3])]
+    assert len(reads) == 2
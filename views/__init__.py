@@ -0,0 +1,18 @@
+import importlib
+
+# Sidebar label of each page and the module in this package that renders it.
+# Modules are imported the first time their page is opened, so libraries
+# only some pages need (plotly.express, pyarrow) stay out of cold start.
+PAGES = {
+    "📊 Dashboard": "dashboard",
+    "➕ Log Workout": "log_workout",
+    "🏋️ Strength Training": "strength",
+    "📈 Progress": "progress",
+    "🍽️ Nutrition": "nutrition",
+    "⚙️ Settings": "settings",
+}
+
+
+def load(page):
+    """Return the module rendering a page, importing it on first use"""
+    return importlib.import_module(f"{__name__}.{PAGES[page]}")
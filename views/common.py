@@ -0,0 +1,23 @@
+import os
+from pathlib import Path
+
+import streamlit as st
+
+# Data persistence
+DATA_DIR = Path("workout_data")
+
+# Render profiling is off unless enabled in Settings > Diagnostics (or with
+# WORKOUT_PROFILE=1); the metrics log is appended to in DATA_DIR
+PROFILE_DEFAULT = os.environ.get("WORKOUT_PROFILE") == "1"
+METRICS_LOG = DATA_DIR / "metrics.jsonl"
+
+# With WORKOUT_INGEST set (e.g. "8765" or "unix:/tmp/workouts.sock") the app
+# also accepts records from devices on that address; see ingest.py
+INGEST_ADDRESS = os.environ.get("WORKOUT_INGEST")
+
+
+def date_range_slider(label, first, last, key):
+    """Let the user zoom a chart to a date range; charts re-render at full detail for it"""
+    if first >= last:
+        return first, last
+    return st.slider(label, min_value=first, max_value=last, value=(first, last), key=key)
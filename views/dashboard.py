@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import plotly.express as px
+import streamlit as st
+
+import core
+
+
+def show(store, user_data, current_user, render):
+    """Render the dashboard: today's stats, this week's activity and recent workouts"""
+    st.title("Welcome to Your Fitness Dashboard")
+    
+    # Get today's stats
+    today = datetime.now().date()
+    today_stats = render.call("aggregate", core.today_stats, store, today)
+    today_minutes = today_stats['minutes']
+    total_calories_in = today_stats['intake']
+    
+    # Quick Stats
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Today's Workouts", today_stats['sessions'], "sessions")
+    with col2:
+        st.metric("Minutes Trained", today_minutes, "min")
+    with col3:
+        if user_data:
+            bmi = user_data.get('bmi', 'N/A')
+            st.metric("BMI", f"{bmi:.1f}" if isinstance(bmi, (int, float)) else bmi)
+        else:
+            st.metric("BMI", "No Data")
+    with col4:
+        st.metric("Calories Logged", total_calories_in, "kcal")
+    
+    # Weekly Overview
+    st.subheader("📅 This Week's Activity")
+    week_df = render.call("aggregate", core.weekly_overview, store, today)
+    
+    with render.phase("chart"):
+        fig = px.bar(week_df, x="Day", y="Minutes", 
+                     color="Minutes", color_continuous_scale="Viridis",
+                     title="Weekly Workout Minutes")
+    render.call("serialize", st.plotly_chart, fig, use_container_width=True)
+    
+    # Latest workouts
+    st.subheader("🏃 Recent Workouts")
+    recent = render.call("filter", core.recent, store, "workouts", 5)
+    render.scanned(len(recent))
+    if recent:
+        for workout in recent:
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                st.write(f"**{workout['date']}** - {workout['category']}")
+            with col2:
+                st.write(f"{workout['minutes']} min")
+            with col3:
+                st.write(f"💪 {workout['intensity']}")
+    else:
+        st.info("No workouts logged yet. Start tracking!")
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import streamlit as st
+
+
+def show(store, user_data, current_user, render):
+    """Render the workout logging form"""
+    st.title("Log Your Workout")
+    
+    # The workout type picks which fields the form shows, so it stays outside it
+    category = st.selectbox("Workout Type", ["Strength", "Cardio", "Flexibility", "Sports"])
+    
+    with st.form("log_workout"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            workout_date = st.date_input("Date", value=datetime.now())
+            workout_time = st.time_input("Time")
+        
+        with col2:
+            minutes = st.number_input("Duration (minutes)", min_value=1, max_value=480, value=30)
+            intensity = st.selectbox("Intensity", ["Light", "Moderate", "High", "Extreme"])
+        
+        breakdown = {}
+        # Muscle group targeting
+        if category == "Strength":
+            st.subheader("Muscle Groups Targeted")
+            muscle_cols = st.columns(3)
+            muscle_options = ["Chest", "Shoulders", "Triceps", "Back", "Biceps", "Legs", "Abs"]
+            
+            for idx, muscle in enumerate(muscle_options):
+                with muscle_cols[idx % 3]:
+                    breakdown[muscle] = st.number_input(f"{muscle} (minutes)", min_value=0, max_value=480, value=0)
+        
+        # Cardio types
+        elif category == "Cardio":
+            st.subheader("Cardio Type")
+            cardio_cols = st.columns(3)
+            cardio_types = ["Cycling", "Treadmill", "Elliptical"]
+            
+            for idx, ctype in enumerate(cardio_types):
+                with cardio_cols[idx]:
+                    breakdown[ctype] = st.number_input(f"{ctype} (minutes)", min_value=0, max_value=480, value=0)
+        
+        notes = st.text_area("Notes")
+        submitted = st.form_submit_button("✅ Save Workout", use_container_width=True)
+    
+    if submitted:
+        workout_data = {
+            'date': str(workout_date),
+            'time': str(workout_time),
+            'minutes': minutes,
+            'intensity': intensity,
+            'category': category,
+            'notes': notes
+        }
+        if category == "Strength":
+            workout_data['muscles'] = breakdown
+        elif category == "Cardio":
+            workout_data['cardio'] = breakdown
+        
+        if any(amount > minutes for amount in breakdown.values()):
+            st.error(f"Each {category.lower()} entry must fit within the {minutes} minute workout.")
+        else:
+            store.append("workouts", workout_data)
+            st.success(f"Workout logged! {minutes} minutes of {category}")
+            st.balloons()
@@ -0,0 +1,169 @@
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import charts
+import core
+import foods
+from views.common import DATA_DIR, date_range_slider
+
+# Foods added from the app, on top of the bundled catalog
+USER_CATALOG = DATA_DIR / "foods.csv"
+
+
+@st.cache_resource
+def food_catalog():
+    """Load the bundled and user food catalogs once per server"""
+    return foods.load_catalog(USER_CATALOG)
+
+
+@st.cache_resource(max_entries=64)
+def daily_calorie_chart(_store, user, version, start, end):
+    """Build the downsampled daily intake figure over a date range"""
+    days, intake = core.daily_intake(_store, start, end)
+    fig, shown = charts.daily_calorie_figure(days, intake)
+    return fig, shown, len(days)
+
+
+def show(store, user_data, current_user, render):
+    """Render the meal form, today's macros, rolling averages and calorie chart"""
+    st.title("Nutrition & Calories Tracker")
+
+    # Pick a food to fill in the form; the user's own frequent and recent
+    # foods rank first and show up before anything is typed
+    catalog = food_catalog()
+    today = datetime.now().date()
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        query = st.text_input("🔎 Search foods", placeholder="e.g., chicken")
+    with render.phase("filter"):
+        usage = core.food_usage(store)
+        matches = catalog.search(query, usage=usage, today=today)
+    choices = {"—": None}
+    for food in matches:
+        label = f"{food['name']} ({food['serving']}, {food['kcal']:g} kcal)"
+        if food['times_logged']:
+            label += f" · logged {food['times_logged']}×"
+        choices[label] = food
+    with col2:
+        food = choices[st.selectbox("Food", list(choices), index=1 if matches and query else 0)]
+    with col3:
+        servings = st.number_input("Servings", min_value=0.25, max_value=20.0, value=1.0, step=0.25)
+    if food is None:
+        food = {'name': "", 'kcal': 500, 'protein': 0.0, 'carbs': 0.0, 'fats': 0.0}
+        servings = 1.0
+
+    with st.form("log_meal", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            cal_date = st.date_input("Date", value=datetime.now())
+            meal_type = st.selectbox("Meal Type", ["Breakfast", "Lunch", "Dinner", "Snack"])
+        
+        with col2:
+            food_item = st.text_input("Food Item", value=food['name'], placeholder="e.g., Chicken Rice")
+            calories_intake = st.number_input("Calories (kcal)", min_value=0, max_value=5000,
+                                              value=min(round(food['kcal'] * servings), 5000))
+        
+        protein = st.number_input("Protein (g)", min_value=0.0, value=round(food['protein'] * servings, 1))
+        carbs = st.number_input("Carbs (g)", min_value=0.0, value=round(food['carbs'] * servings, 1))
+        fats = st.number_input("Fats (g)", min_value=0.0, value=round(food['fats'] * servings, 1))
+        notes = st.text_area("Notes")
+        
+        submitted = st.form_submit_button("📝 Log Meal", use_container_width=True)
+    
+    if submitted:
+        calorie_entry = {
+            'date': str(cal_date),
+            'meal_type': meal_type,
+            'food': food_item,
+            'intake': calories_intake,
+            'protein': protein,
+            'carbs': carbs,
+            'fats': fats,
+            'notes': notes
+        }
+        store.append("calories", calorie_entry)
+        st.success(f"Meal logged: {food_item} ({calories_intake} kcal)")
+
+    with st.expander("➕ Add a food to the catalog"):
+        with st.form("add_food", clear_on_submit=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                new_name = st.text_input("Name", placeholder="e.g., Grandma's Lasagna")
+                new_serving = st.text_input("Serving", placeholder="e.g., 1 slice (200 g)")
+                new_kcal = st.number_input("Calories per serving (kcal)", min_value=0.0, value=0.0)
+            with col2:
+                new_protein = st.number_input("Protein per serving (g)", min_value=0.0, value=0.0)
+                new_carbs = st.number_input("Carbs per serving (g)", min_value=0.0, value=0.0)
+                new_fats = st.number_input("Fats per serving (g)", min_value=0.0, value=0.0)
+            added = st.form_submit_button("Add Food")
+        if added:
+            if new_name.strip():
+                catalog.add(new_name, new_serving.strip() or "1 serving", new_kcal,
+                            new_protein, new_carbs, new_fats)
+                foods.save_food(USER_CATALOG, catalog.get(new_name))
+                st.success(f"Added {new_name.strip()} to the food catalog")
+            else:
+                st.error("Please enter a food name")
+    
+    st.subheader("📊 Calorie Analysis")
+    
+    if render.call("load", store.count, "calories"):
+        # Today's calories
+        analysis = render.call("aggregate", core.calorie_analysis, store, today,
+                               user_data.get('daily_goal_cal', 2000))
+        
+        col1, col2, col3, col4 = st.columns(4)
+        total_cal = analysis['intake']
+        total_protein = analysis['protein']
+        total_carbs = analysis['carbs']
+        total_fats = analysis['fats']
+        
+        with col1:
+            st.metric("Total Calories", f"{total_cal} kcal")
+        with col2:
+            st.metric("Protein", f"{total_protein}g")
+        with col3:
+            st.metric("Carbs", f"{total_carbs}g")
+        with col4:
+            st.metric("Fats", f"{total_fats}g")
+        
+        # Macro breakdown pie chart
+        if total_protein + total_carbs + total_fats > 0:
+            with render.phase("chart"):
+                macro_fig = px.pie(
+                    values=list(analysis['macro_kcal'].values()),
+                    names=list(analysis['macro_kcal']),
+                    title="Today's Macro Distribution"
+                )
+            render.call("serialize", st.plotly_chart, macro_fig, use_container_width=True)
+
+        # Rolling averages against the daily goal
+        st.write("### 📈 Rolling Averages")
+        render.call("serialize", st.dataframe, analysis['rolling'], use_container_width=True, hide_index=True)
+
+        # Weekly calorie trend
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("### 📅 Weekly Calorie Intake")
+            first, last = store.date_span("calories")
+            start, end = date_range_slider("Date range", first, last, key="calorie_range")
+            with render.phase("chart"):
+                fig, shown, total = daily_calorie_chart(store, current_user, store.version("calories"), start, end)
+            render.call("serialize", st.plotly_chart, fig, use_container_width=True)
+            if shown < total:
+                st.caption(f"Each bar averages {total / shown:.1f} days; narrow the date range for daily bars.")
+        
+        with col2:
+            st.write("### 🥗 Recent Meals")
+            recent_meals = render.call("filter", core.recent, store, "calories", 10)
+            render.scanned(len(recent_meals))
+            with render.phase("serialize"):
+                meal_df = pd.DataFrame(recent_meals)
+                st.dataframe(meal_df[['date', 'meal_type', 'food', 'intake']], use_container_width=True)
+    else:
+        st.info("No meals logged yet. Start tracking your nutrition!")
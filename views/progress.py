@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import plotly.express as px
+import streamlit as st
+
+import core
+
+
+def show(store, user_data, current_user, render):
+    """Render the muscle group, training volume and weekly report tabs"""
+    st.title("Your Progress")
+    
+    tab1, tab2, tab3 = st.tabs(["Muscle Groups", "Total Volume", "Weekly Report"])
+    
+    with tab1:
+        st.subheader("🎯 Muscle Group Distribution")
+        
+        # Aggregate muscle group data
+        workout_count = render.call("load", store.count, "workouts")
+        df_muscles = render.call("aggregate", core.muscle_totals, store)
+        
+        with render.phase("chart"):
+            fig = px.bar(df_muscles, x="Minutes", y="Muscle Group", orientation="h",
+                         color="Minutes", color_continuous_scale="Teal",
+                         title="Total Minutes by Muscle Group")
+        render.call("serialize", st.plotly_chart, fig, use_container_width=True)
+    
+    with tab2:
+        st.subheader("📊 Total Training Volume")
+        
+        # Monthly volume
+        if workout_count:
+            monthly_volume = render.call("aggregate", core.monthly_volume, store)
+            
+            with render.phase("chart"):
+                fig = px.bar(monthly_volume, x='month', y='minutes',
+                            title="Monthly Training Volume",
+                            labels={'month': 'Month', 'minutes': 'Minutes'},
+                            color='minutes', color_continuous_scale="Viridis")
+            render.call("serialize", st.plotly_chart, fig, use_container_width=True)
+            
+            # Workout category distribution
+            category_dist = render.call("aggregate", core.category_distribution, store)
+            with render.phase("chart"):
+                fig = px.pie(category_dist, values='minutes', names='category',
+                            title="Workout Type Distribution")
+            render.call("serialize", st.plotly_chart, fig, use_container_width=True)
+        else:
+            st.info("No workout data yet")
+    
+    with tab3:
+        st.subheader("📋 Weekly Report")
+        
+        # Last 4 weeks
+        df_weeks = render.call("aggregate", core.weekly_report, store, datetime.now().date())
+        render.call("serialize", st.dataframe, df_weeks, use_container_width=True)
@@ -0,0 +1,182 @@
+import json
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+import exporter
+import importer
+import profiling
+from storage import ConflictError, import_data
+from views.common import METRICS_LOG, PROFILE_DEFAULT
+
+
+def show(store, user_data, current_user, render):
+    """Render the profile form, data management, import/export and diagnostics"""
+    st.title("Settings & Profile")
+    
+    goals = ["Weight Loss", "Muscle Gain", "General Fitness", "Endurance"]
+    with st.form("profile"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📊 Body Measurements")
+            height = st.number_input("Height (cm)", min_value=100.0, max_value=250.0, 
+                                    value=user_data.get('height', 170.0))
+            weight = st.number_input("Weight (kg)", min_value=30.0, max_value=200.0,
+                                   value=user_data.get('weight', 70.0))
+            age = st.number_input("Age", min_value=1, max_value=120,
+                                 value=user_data.get('age', 25))
+        
+        with col2:
+            st.subheader("🎯 Goals")
+            goal = st.selectbox("Fitness Goal", goals,
+                               index=goals.index(user_data.get('goal', "Weight Loss")))
+            daily_goal_cal = st.number_input("Daily Calorie Goal (kcal)", min_value=1000, max_value=5000,
+                                             value=user_data.get('daily_goal_cal', 2000))
+        
+        submitted = st.form_submit_button("💾 Save Profile", use_container_width=True)
+    
+    # Calculate BMI
+    bmi = weight / ((height / 100) ** 2)
+    
+    if submitted:
+        user_data = {
+            'height': height,
+            'weight': weight,
+            'age': age,
+            'goal': goal,
+            'daily_goal_cal': daily_goal_cal,
+            'bmi': bmi
+        }
+        try:
+            store.save_user_data(user_data, expected=st.session_state.get(f'profile_revision_{current_user}'))
+        except ConflictError:
+            user_data = store.load_user_data()
+            st.error("This profile was changed in another session. Review the values and save again.")
+        else:
+            st.success("Profile saved successfully!")
+    # Saving only succeeds if nobody else saved since this form was shown
+    st.session_state[f'profile_revision_{current_user}'] = store.revision("user_data")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("BMI", f"{bmi:.2f}", user_data.get('bmi', 0))
+    with col2:
+        # BMI Category
+        if bmi < 18.5:
+            bmi_status = "Underweight"
+        elif bmi < 25:
+            bmi_status = "Normal Weight"
+        elif bmi < 30:
+            bmi_status = "Overweight"
+        else:
+            bmi_status = "Obese"
+        st.write(f"**BMI Status:** {bmi_status}")
+    
+    st.divider()
+    
+    # Data Management
+    st.subheader("📁 Data Management")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("🗑️ Clear Workouts", use_container_width=True):
+            store.clear("workouts")
+            st.warning("All workout data cleared!")
+    
+    with col2:
+        if st.button("🗑️ Clear Strength Logs", use_container_width=True):
+            store.clear("strength_logs")
+            st.warning("All strength logs cleared!")
+    
+    with col3:
+        if st.button("🗑️ Clear Calories", use_container_width=True):
+            store.clear("calories")
+            st.warning("All calorie data cleared!")
+    
+    st.divider()
+    
+    # Export data
+    st.subheader("📤 Import & Export Data")
+    col1, col2 = st.columns(2)
+    with col1:
+        export_format = st.selectbox("Export format", exporter.FORMATS)
+    with col2:
+        export_compression = st.selectbox("Compression", exporter.COMPRESSIONS)
+    export_start = export_end = None
+    if st.checkbox("Only export a date range"):
+        col1, col2 = st.columns(2)
+        with col1:
+            export_start = st.date_input("From", datetime.now().date() - timedelta(days=30))
+        with col2:
+            export_end = st.date_input("To", datetime.now().date())
+    if st.button("📥 Prepare Export", use_container_width=True):
+        # Written chunk by chunk to disk; only the compressed archive is
+        # handed to the browser
+        with tempfile.TemporaryFile() as export_file:
+            exporter.export_archive(store, export_file, export_format, export_compression,
+                                    export_start, export_end)
+            export_file.seek(0)
+            st.download_button(
+                label="Download Export",
+                data=export_file.read(),
+                file_name=f"fitness_data_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip"
+            )
+    
+    uploaded_file = st.file_uploader("Import an export (.zip, or .json from older versions)",
+                                     type=["zip", "json"])
+    if uploaded_file is not None and st.button("📤 Import Data", use_container_width=True):
+        if uploaded_file.name.lower().endswith(".zip"):
+            exporter.import_archive(store, uploaded_file)
+        else:
+            import_data(store, json.load(uploaded_file))
+        st.success("Data imported successfully!")
+    
+    # Bulk import from other trackers
+    st.write("#### 📥 Bulk Import from Other Trackers")
+    import_collections = {"Workouts": "workouts", "Strength Logs": "strength_logs", "Calories": "calories"}
+    import_collection = import_collections[st.selectbox("Import into", list(import_collections))]
+    st.caption("CSV or NDJSON with one entry per row. Required columns: "
+               + ", ".join(importer.REQUIRED_FIELDS[import_collection])
+               + ". Rows already in your history are skipped.")
+    bulk_file = st.file_uploader("CSV or NDJSON file", type=["csv", "ndjson", "jsonl"])
+    if bulk_file is not None and st.button("📥 Import File", use_container_width=True):
+        import_progress = st.progress(0.0, text="Importing...")
+        
+        def report_progress(totals):
+            import_progress.progress(min(bulk_file.tell() / max(bulk_file.size, 1), 1.0),
+                                     text=f"{totals['read']:,} rows read, {totals['imported']:,} imported")
+        
+        import_format = "csv" if bulk_file.name.lower().endswith(".csv") else "ndjson"
+        totals = importer.import_file(store, import_collection, bulk_file, import_format,
+                                      progress=report_progress)
+        import_progress.progress(1.0, text="Import finished")
+        st.success(f"Imported {totals['imported']:,} of {totals['read']:,} rows "
+                   f"({totals['duplicates']:,} duplicates, {totals['invalid']:,} invalid rows skipped)")
+    
+    st.divider()
+    
+    # Render profiling (off by default)
+    with st.expander("🩺 Diagnostics"):
+        # Widget state is dropped on other pages, so the switches are copied
+        # to plain session state keys that the next render reads
+        def copy_setting(key):
+            st.session_state[key] = st.session_state[f'{key}_toggle']
+        
+        st.checkbox("Profile page renders", value=st.session_state.get('profiling', PROFILE_DEFAULT),
+                    key='profiling_toggle', on_change=copy_setting, args=('profiling',))
+        st.checkbox(f"Append samples to {METRICS_LOG}", value=st.session_state.get('profiling_log', False),
+                    key='profiling_log_toggle', on_change=copy_setting, args=('profiling_log',))
+        diagnostics = profiling.summary()
+        if diagnostics:
+            st.caption(f"Rolling p50/p95 over the last {profiling.WINDOW} renders of each page, in ms "
+                       "(records: rows aggregated or listed per render; cached results read none). "
+                       "Samples are shared by every session of this server.")
+            st.dataframe(pd.DataFrame(diagnostics), use_container_width=True, hide_index=True)
+            st.button("Reset samples", on_click=profiling.reset)
+        else:
+            st.caption("No samples yet. Turn on profiling and open a few pages.")
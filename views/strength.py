@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+import charts
+import core
+from records import RECORD_KINDS, new_records
+from views.common import date_range_slider
+
+# Columns shown in the strength history and its page sizes
+HISTORY_FIELDS = ['date', 'exercise', 'muscle_group', 'weight', 'reps', 'sets', 'rpe', 'notes']
+HISTORY_PAGE_SIZES = [25, 50, 100]
+
+
+@st.cache_resource(max_entries=64)
+def strength_progress_chart(_store, user, version, exercise, start, end):
+    """Build the downsampled progress figure of one exercise over a date range"""
+    days, weights = core.strength_progress(_store, exercise, start, end)
+    fig, shown = charts.strength_progress_figure(exercise, days, weights)
+    return fig, shown, len(days)
+
+
+def show(store, user_data, current_user, render):
+    """Render the strength log form, paged history, personal records and progress chart"""
+    st.title("Strength Training Log")
+    
+    with st.form("log_strength"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            exercise_name = st.text_input("Exercise Name", placeholder="e.g., Bench Press")
+            muscle_group = st.selectbox("Muscle Group", ["Chest", "Shoulders", "Triceps", "Back", "Biceps", "Legs", "Abs"])
+        
+        with col2:
+            log_date = st.date_input("Date", value=datetime.now())
+            reps = st.number_input("Reps", min_value=1, max_value=100, value=10)
+        
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            weight = st.number_input("Weight (kg)", min_value=0.0, step=0.5, value=0.0)
+            sets = st.number_input("Sets", min_value=1, max_value=10, value=3)
+        
+        with col4:
+            rpe = st.slider("RPE (Rate of Perceived Exertion)", 1, 10, 7)
+            notes = st.text_area("Notes")
+        
+        submitted = st.form_submit_button("💾 Save Strength Entry", use_container_width=True)
+    
+    if submitted:
+        strength_entry = {
+            'date': str(log_date),
+            'exercise': exercise_name,
+            'muscle_group': muscle_group,
+            'weight': weight,
+            'reps': reps,
+            'sets': sets,
+            'rpe': rpe,
+            'notes': notes
+        }
+        new_prs = new_records(store.personal_records(exercise_name), strength_entry)
+        store.append("strength_logs", strength_entry)
+        st.success(f"Strength log saved: {exercise_name}")
+        if new_prs:
+            st.success("🏆 New personal record: " + ", ".join(RECORD_KINDS[kind] for kind in new_prs))
+        st.balloons()
+    
+    # View strength logs
+    st.subheader("📋 Strength Training History")
+    if render.call("load", store.count, "strength_logs"):
+        # Filter by muscle group and exercise
+        filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
+        with filter_col1:
+            muscle_filter = st.selectbox("Filter by Muscle Group",
+                                         ["All"] + render.call("filter", store.distinct, "strength_logs", "muscle_group"))
+        filters = {} if muscle_filter == "All" else {'muscle_group': muscle_filter}
+        exercises = render.call("filter", store.distinct, "strength_logs", "exercise", **filters)
+        with filter_col2:
+            exercise_filter = st.selectbox("Filter by Exercise", ["All"] + exercises)
+        with filter_col3:
+            page_size = st.selectbox("Rows per page", HISTORY_PAGE_SIZES)
+        page_filters = dict(filters) if exercise_filter == "All" else {**filters, 'exercise': exercise_filter}
+        
+        # Keyset pagination: the cursors of the pages before the current one
+        history_key = (current_user, muscle_filter, exercise_filter, page_size)
+        if st.session_state.get('history_key') != history_key:
+            st.session_state.history_key = history_key
+            st.session_state.history_cursors = [None]
+        cursors = st.session_state.history_cursors
+        with render.phase("filter"):
+            history, next_cursor = store.page("strength_logs", page_size, cursors[-1],
+                                              fields=HISTORY_FIELDS, **page_filters)
+        render.scanned(len(history))
+        
+        with render.phase("serialize"):
+            st.dataframe(pd.DataFrame(history, columns=HISTORY_FIELDS), use_container_width=True, hide_index=True)
+        
+        nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+        with nav_col1:
+            st.button("⬅️ Newer", disabled=len(cursors) == 1, use_container_width=True,
+                      on_click=cursors.pop)
+        with nav_col2:
+            st.caption(f"Page {len(cursors)}")
+        with nav_col3:
+            st.button("Older ➡️", disabled=next_cursor is None, use_container_width=True,
+                      on_click=cursors.append, args=(next_cursor,))
+        
+        # Progress chart for top exercises
+        if exercises:
+            selected_exercise = st.selectbox("Track Exercise Progress", exercises)
+            
+            exercise_records = render.call("aggregate", store.personal_records, selected_exercise)
+            
+            if exercise_records:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("🏆 Best Weight", f"{exercise_records['weight']['value']} kg",
+                              exercise_records['weight']['date'], delta_color="off")
+                with col2:
+                    st.metric("🏆 Est. 1RM", f"{exercise_records['1rm']['value']:.1f} kg",
+                              exercise_records['1rm']['date'], delta_color="off")
+                with col3:
+                    st.metric("🏆 Best Volume", f"{exercise_records['volume']['value']:.0f} kg",
+                              exercise_records['volume']['date'], delta_color="off")
+                
+                progress = exercise_records['progress']
+                start, end = date_range_slider("Date range",
+                                               datetime.fromisoformat(progress[0][0]).date(),
+                                               datetime.fromisoformat(progress[-1][0]).date(),
+                                               key=f"progress_range_{selected_exercise}")
+                with render.phase("chart"):
+                    fig, shown, total = strength_progress_chart(store, current_user, store.version("strength_logs"),
+                                                                selected_exercise, start, end)
+                render.call("serialize", st.plotly_chart, fig, use_container_width=True)
+                if shown < total:
+                    st.caption(f"Showing {shown} of {total} training days; narrow the date range for full detail.")
+    else:
+        st.info("No strength logs yet. Start tracking your lifts!")